@@ -38,7 +38,7 @@ class AdaptiveWaitManager:
     def record_click_time(self, elapsed: float):
         """Record time taken for a click to be reflected"""
         self.click_times.append(elapsed)
-        logger.debug(f"Recorded click time: {elapsed:.3f}s")
+        logger.debug("Recorded click time: %.3fs", elapsed)
 
     def record_submit_time(self, elapsed: float):
         """Record time taken for form submission"""
@@ -67,7 +67,7 @@ class AdaptiveWaitManager:
         avg = sum(self.click_times) / len(self.click_times)
         # Use 1.5x average, but cap at max_timeout
         optimal = min(avg * 1.5, max_timeout)
-        logger.debug(f"Click timeout: {optimal:.3f}s (avg: {avg:.3f}s)")
+        logger.debug("Click timeout: %.3fs (avg: %.3fs)", optimal, avg)
         return optimal
 
     def get_submit_timeout(self, default: float = 5.0, max_timeout: float = 10.0) -> float:
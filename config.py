@@ -9,6 +9,7 @@ class Config:
     WEBDRIVER_TIMEOUT = 20
     IMPLICIT_WAIT = 5
     PAGE_LOAD_TIMEOUT = 60
+    WEBDRIVER_POOL_MAXSIZE = 20  # keep-alive connections to the driver service
     HEADLESS_MODE = False
     
     # Browser settings
@@ -4,6 +4,7 @@ Enhanced Web Form Automation System with Action Recording and Playback
 
 import logging
 import sys
+import threading
 import time
 from pathlib import Path
 from typing import Optional, List, Dict, Any
@@ -56,6 +57,10 @@ class EnhancedAutomationSystem:
         self.current_batch = 0
         self.total_batches = 0
         self.form_input_ready = False  # Flag to control form input start
+        self.form_input_done_event = threading.Event()  # Set when an authorized form input finishes
+        self.form_input_succeeded = False  # Outcome of the last authorized form input
+        self.more_form_input = False  # Another authorized form input follows the current one
+        self.completed_form_inputs = 0  # Authorized form inputs finished in this run
         self.voting_page_reached = False
         
         # Progress callback function (optional)
@@ -170,8 +175,17 @@ class EnhancedAutomationSystem:
             self.logger.error(f"❌ Error recovery failed: {e}")
             return False
     
-    def start_form_input(self):
-        """Signal that form input can begin"""
+    def start_form_input(self, more_batches: bool = False):
+        """
+        Signal that form input can begin
+        
+        Args:
+            more_batches: Another batch will be authorized after this one, so basic
+                mode waits for it instead of ending the run
+        """
+        self.form_input_done_event.clear()
+        self.form_input_succeeded = False
+        self.more_form_input = more_batches
         self.form_input_ready = True
         self.logger.info("Form input authorized - processing will continue")
     
@@ -305,8 +319,28 @@ class EnhancedAutomationSystem:
         if not self._wait_for_voting_page():
             return False
         
-        # Process data using original method
-        return self._process_data_batches()
+        # Process data using original method once per authorized form input. Each
+        # outcome is handed back to whoever authorized it, and the run keeps serving
+        # authorizations while the GUI has announced more batches
+        all_succeeded = True
+        while True:
+            success = more_batches = False
+            try:
+                success = self._process_data_batches()
+            finally:
+                # Read before signalling: the next authorization may overwrite it
+                more_batches = self.more_form_input
+                self.form_input_succeeded = success
+                self.form_input_ready = False
+                self.completed_form_inputs += 1
+                self.form_input_done_event.set()
+            
+            all_succeeded = all_succeeded and success
+            if not success or not more_batches:
+                return all_succeeded
+            
+            if not self._wait_for_form_input_authorization():
+                return False
     
     def _setup_webdriver(self) -> bool:
         """Setup WebDriver and form filler"""
@@ -587,8 +621,9 @@ class EnhancedAutomationSystem:
     def _process_single_batch_basic(self, batch_data: List[List[int]]) -> bool:
         """Process single batch using basic method with enhanced loop handling"""
         try:
-            # For batches after the first, we need to navigate from addition page
-            if self.current_batch > 1:
+            # For batches after the first (including later authorized form inputs),
+            # we need to navigate from addition page
+            if self.current_batch > 1 or self.completed_form_inputs > 0:
                 self.logger.info("🔄 Navigating from voting addition page to single voting page...")
                 
                 # Update progress for navigation
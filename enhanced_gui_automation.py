@@ -4,6 +4,7 @@ Enhanced GUI Application with Action Recording and Playback
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
+import functools
 import threading
 import queue
 import logging
@@ -11,7 +12,7 @@ from pathlib import Path
 import sys
 import os
 import json
-from typing import Optional
+from typing import List, Optional, Tuple
 
 # Import enhanced automation components
 from config import Config
@@ -84,10 +85,21 @@ class EnhancedAutomationGUI:
         
         # Data state
         self.data_handler = None
-        self.available_batches = []
+        self.available_batches: Tuple[Tuple[List[int], ...], ...] = ()  # Read-only once split
+        self._batch_option_cache = []  # "Batch N (M sets)" labels for available_batches
+        self._batches_version = 0  # Bumped whenever available_batches changes
+        self._combo_version_seen = -1  # Version last pushed to form_input_batch_combo
+        self._multi_batch_version_seen = -1  # Version the multi batch checkboxes were built for
         self.batch_checkboxes = []  # For multi-batch selection
+        self._var_pool = []  # Reusable BooleanVars, one per batch ever shown
+        self._cb_pool = []  # Reusable Checkbuttons bound to _var_pool entries
         self.current_batch_index = 0
         self.processing_all_batches = False
+        self._batch_queue = ()  # (batch index, batch data) pairs for "All Batches"
+        
+        # Deferred widget updates, applied together in one idle pass
+        self._pending_ui_ops = []
+        self._ui_flush_scheduled = False
         
         # Enhanced automation system
         self.automation_system: Optional[EnhancedAutomationSystem] = None
@@ -109,6 +121,14 @@ class EnhancedAutomationGUI:
         self.create_widgets()
         self.setup_logging_handler()
         
+        # Batch mode widgets are static once built, so check for them only once
+        self._has_batch_mode_ui = all(
+            hasattr(self, name) for name in (
+                'single_batch_frame', 'multi_batch_frame', 'form_input_batch_combo',
+                'start_form_input_button', 'start_all_batches_button',
+            )
+        )
+        
         # Start log processing
         self.process_log_queue()
         
@@ -282,6 +302,14 @@ class EnhancedAutomationGUI:
         # Multiple batch selection
         self.multi_batch_frame = ttk.LabelFrame(self.form_input_frame, text="Batch Selection", padding=5)
         
+        # Static children of the multi batch frame, packed by setup_multi_batch_selection
+        self.no_batches_label = ttk.Label(self.multi_batch_frame, text="No batches available")
+        self.select_batches_label = ttk.Label(self.multi_batch_frame, text="Select batches to process:")
+        self.select_all_batches_var = tk.BooleanVar()
+        self.select_all_batches_cb = ttk.Checkbutton(
+            self.multi_batch_frame, text="Select All", variable=self.select_all_batches_var,
+            command=lambda: self.toggle_all_batches(self.select_all_batches_var.get()))
+        
         # Processing status
         self.processing_status_frame = ttk.Frame(self.form_input_frame)
         self.processing_status_frame.pack(fill=tk.X, pady=5)
@@ -613,7 +641,7 @@ class EnhancedAutomationGUI:
                 return
             
             # Split into batches and update UI
-            self.available_batches = self.data_handler.split_data_into_batches()
+            self._set_available_batches(self.data_handler.split_data_into_batches())
             self.update_batch_selection()
             
             # Get data info and preview
@@ -830,9 +858,11 @@ class EnhancedAutomationGUI:
         )
         if filename:
             try:
-                with open(filename, 'w', encoding='utf-8') as f:
-                    logs = self.log_display.get(1.0, tk.END)
-                    f.write(logs)
+                logs = self.log_display.get(1.0, tk.END)
+                # Translate line endings and encode in one pass, then write in binary
+                data = logs.replace('\n', os.linesep).encode('utf-8', errors='replace')
+                with open(filename, 'wb', buffering=1 << 20) as f:
+                    f.write(data)
                 messagebox.showinfo("Success", f"Logs saved to {filename}")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to save logs: {e}")
@@ -850,13 +880,21 @@ class EnhancedAutomationGUI:
                     messagebox.showerror("Error", "Failed to load CSV data")
                     return
             
-            self.available_batches = self.data_handler.split_data_into_batches()
+            self._set_available_batches(self.data_handler.split_data_into_batches())
             self.update_batch_selection()
             self.update_status(f"Updated batches: {len(self.available_batches)} available")
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to update batches: {e}")
     
+    def _set_available_batches(self, batches):
+        """Store newly split batches and rebuild their combobox labels"""
+        # Batches are never mutated after the split; tuples also make them safe
+        # to share with the batch queue worker thread
+        self.available_batches = tuple(tuple(batch) for batch in batches)
+        self._batch_option_cache = [f"Batch {i+1} ({len(batch)} sets)" for i, batch in enumerate(batches)]
+        self._batches_version += 1
+    
     def update_batch_selection(self):
         """Update batch selection combobox"""
         if not self.available_batches:
@@ -864,11 +902,8 @@ class EnhancedAutomationGUI:
             self.batch_combo.set("No batches available")
             return
         
-        # Create batch options with details
-        batch_options = []
-        for i, batch in enumerate(self.available_batches):
-            batch_info = f"Batch {i+1} ({len(batch)} sets)"
-            batch_options.append(batch_info)
+        # Batch options with details
+        batch_options = self._batch_option_cache
         
         self.batch_combo['values'] = batch_options
         self.batch_combo.set(batch_options[0])
@@ -929,22 +964,33 @@ class EnhancedAutomationGUI:
         except (IndexError, ValueError) as e:
             messagebox.showerror("Error", f"Failed to start form input: {e}")
     
+    def _queue_ui_op(self, func, *args, **kwargs):
+        """Queue a widget update so consecutive updates share one layout pass"""
+        self._pending_ui_ops.append(functools.partial(func, *args, **kwargs))
+        if not self._ui_flush_scheduled:
+            self._ui_flush_scheduled = True
+            self.root.after_idle(self._flush_ui)
+    
+    def _flush_ui(self):
+        """Apply all queued widget updates; Tk lays them out in its next idle pass"""
+        pending_ops, self._pending_ui_ops = self._pending_ui_ops, []
+        self._ui_flush_scheduled = False
+        for op in pending_ops:
+            op()
+    
     def check_voting_page_status(self):
         """Check and update voting page status"""
         if self.automation_system and self.automation_system.is_voting_page_ready():
-            self.voting_page_status.config(text="✅ Voting page ready", foreground="green")
-            self.form_input_frame.pack(fill=tk.X, padx=10, pady=5)
+            self._queue_ui_op(self.voting_page_status.config, text="✅ Voting page ready", foreground="green")
+            self._queue_ui_op(self.form_input_frame.pack, fill=tk.X, padx=10, pady=5)
             
             # Update batch mode UI
             self.update_batch_mode()
             
-            # Update form input batch combo
-            if self.available_batches:
-                batch_options = []
-                for i, batch in enumerate(self.available_batches):
-                    batch_info = f"Batch {i+1} ({len(batch)} sets)"
-                    batch_options.append(batch_info)
-                self.form_input_batch_combo['values'] = batch_options
+            # Update form input batch combo only when the batches have changed
+            if self.available_batches and self._combo_version_seen != self._batches_version:
+                self.form_input_batch_combo['values'] = self._batch_option_cache
+                self._combo_version_seen = self._batches_version
                 # Don't automatically set to first batch - let user choose
                 if not self.form_input_batch_combo.get():
                     self.form_input_batch_combo.set("")
@@ -956,61 +1002,76 @@ class EnhancedAutomationGUI:
     def update_batch_mode(self):
         """Update UI based on selected batch mode"""
         # Check if UI elements exist
-        if not hasattr(self, 'single_batch_frame') or not hasattr(self, 'multi_batch_frame'):
+        if not getattr(self, '_has_batch_mode_ui', False):
             return
         
         mode = self.batch_mode.get()
         
         if mode == "single":
-            self.single_batch_frame.pack(fill=tk.X, pady=5)
-            self.multi_batch_frame.pack_forget()
-            if hasattr(self, 'start_form_input_button'):
-                # Enable button only if a batch is selected and voting page is ready
-                batch_selected = hasattr(self, 'form_input_batch_combo') and self.form_input_batch_combo.get()
-                page_ready = self.automation_system and self.automation_system.is_voting_page_ready()
-                self.start_form_input_button.config(state=tk.NORMAL if batch_selected and page_ready else tk.DISABLED)
-            if hasattr(self, 'start_all_batches_button'):
-                self.start_all_batches_button.config(state=tk.DISABLED)
+            self._queue_ui_op(self.single_batch_frame.pack, fill=tk.X, pady=5)
+            self._queue_ui_op(self.multi_batch_frame.pack_forget)
+            # Enable button only if a batch is selected and voting page is ready
+            batch_selected = self.form_input_batch_combo.get()
+            page_ready = self.automation_system and self.automation_system.is_voting_page_ready()
+            self._queue_ui_op(self.start_form_input_button.config,
+                              state=tk.NORMAL if batch_selected and page_ready else tk.DISABLED)
+            self._queue_ui_op(self.start_all_batches_button.config, state=tk.DISABLED)
         elif mode == "all":
-            self.single_batch_frame.pack_forget()
+            self._queue_ui_op(self.single_batch_frame.pack_forget)
             self.setup_multi_batch_selection()
-            self.multi_batch_frame.pack(fill=tk.X, pady=5)
-            if hasattr(self, 'start_form_input_button'):
-                self.start_form_input_button.config(state=tk.DISABLED)
-            if hasattr(self, 'start_all_batches_button'):
-                self.start_all_batches_button.config(state=tk.NORMAL if self.automation_system and self.automation_system.is_voting_page_ready() else tk.DISABLED)
+            self._queue_ui_op(self.start_form_input_button.config, state=tk.DISABLED)
+            page_ready = self.automation_system and self.automation_system.is_voting_page_ready()
+            self._queue_ui_op(self.start_all_batches_button.config,
+                              state=tk.NORMAL if page_ready else tk.DISABLED)
     
     def setup_multi_batch_selection(self):
         """Setup multiple batch selection UI"""
-        # Clear existing checkboxes
-        for widget in self.multi_batch_frame.winfo_children():
-            widget.destroy()
-        self.batch_checkboxes.clear()
+        # The status poll calls this every second; rebuilding would reset the
+        # user's selection, so the checkboxes are only rebuilt for new batches
+        if self._multi_batch_version_seen == self._batches_version:
+            self._queue_ui_op(self.multi_batch_frame.pack, fill=tk.X, pady=5)
+            return
+        self._multi_batch_version_seen = self._batches_version
+        
+        # Hide existing children; they are re-packed below in display order
+        for widget in self.multi_batch_frame.pack_slaves():
+            self._queue_ui_op(widget.pack_forget)
+        self.batch_checkboxes = []
         
         if not self.available_batches:
-            ttk.Label(self.multi_batch_frame, text="No batches available").pack()
+            self._queue_ui_op(self.no_batches_label.pack)
+            self._queue_ui_op(self.multi_batch_frame.pack, fill=tk.X, pady=5)
             return
         
-        ttk.Label(self.multi_batch_frame, text="Select batches to process:").pack(anchor=tk.W, pady=2)
-        
-        # Add "Select All" checkbox
-        select_all_var = tk.BooleanVar()
-        select_all_cb = ttk.Checkbutton(self.multi_batch_frame, text="Select All", 
-                                       variable=select_all_var, command=lambda: self.toggle_all_batches(select_all_var.get()))
-        select_all_cb.pack(anchor=tk.W, pady=2)
-        
-        # Add individual batch checkboxes
-        for i, batch in enumerate(self.available_batches):
-            var = tk.BooleanVar(value=True)  # Default to selected
-            text = f"Batch {i+1} ({len(batch)} sets)"
-            cb = ttk.Checkbutton(self.multi_batch_frame, text=text, variable=var)
-            cb.pack(anchor=tk.W, padx=20, pady=1)
-            self.batch_checkboxes.append(var)
+        self._queue_ui_op(self.select_batches_label.pack, anchor=tk.W, pady=2)
+        
+        # "Select All" checkbox
+        self.select_all_batches_var.set(False)
+        self._queue_ui_op(self.select_all_batches_cb.pack, anchor=tk.W, pady=2)
+        
+        # Add individual batch checkboxes, growing the pools on demand
+        for i, text in enumerate(self._batch_option_cache):
+            if i == len(self._var_pool):
+                var = tk.BooleanVar()
+                self._var_pool.append(var)
+                self._cb_pool.append(ttk.Checkbutton(self.multi_batch_frame, text=text, variable=var))
+            else:
+                self._cb_pool[i].config(text=text)
+            self._var_pool[i].set(True)  # Default to selected
+            self._queue_ui_op(self._cb_pool[i].pack, anchor=tk.W, padx=20, pady=1)
+        
+        self.batch_checkboxes = self._var_pool[:len(self.available_batches)]
+        
+        self._queue_ui_op(self.multi_batch_frame.pack, fill=tk.X, pady=5)
     
     def toggle_all_batches(self, select_all: bool):
         """Toggle all batch checkboxes"""
-        for var in self.batch_checkboxes:
-            var.set(select_all)
+        if not self.batch_checkboxes:
+            return
+        # The batch checkbuttons have no command callbacks, so every variable
+        # can be set in a single Tcl evaluation instead of one call per var
+        value = int(bool(select_all))
+        self.root.tk.eval('\n'.join(f'set {var} {value}' for var in self.batch_checkboxes))
     
     def start_all_batches(self):
         """Start processing all selected batches"""
@@ -1031,55 +1092,67 @@ class EnhancedAutomationGUI:
         # Start processing
         self.processing_all_batches = True
         self.current_batch_index = 0
-        self.selected_batch_indices = selected_batches
+        self._batch_queue = tuple((i, self.available_batches[i]) for i in selected_batches)
         
         # Update UI
         self.start_all_batches_button.config(state=tk.DISABLED)
         self.batch_progress['maximum'] = len(selected_batches)
         self.batch_progress['value'] = 0
         
-        # Start with first batch
-        self.process_next_batch()
+        # Feed the batches from a worker thread that waits for each one to complete
+        threading.Thread(target=self._run_batch_queue, daemon=True).start()
     
-    def process_next_batch(self):
-        """Process the next batch in the sequence"""
-        if not self.processing_all_batches or self.current_batch_index >= len(self.selected_batch_indices):
-            self.complete_all_batches_processing()
-            return
+    def _run_batch_queue(self):
+        """Process the queued batches in sequence (runs in a worker thread)"""
+        automation_system = self.automation_system
+        done_event = automation_system.form_input_done_event
+        error = None
         
         try:
-            # Get current batch to process
-            batch_index = self.selected_batch_indices[self.current_batch_index]
-            batch_data = self.available_batches[batch_index]
-            
-            # Update UI
-            self.current_batch_label.config(text=f"Processing Batch {batch_index + 1} ({len(batch_data)} sets)")
-            self.batch_progress['value'] = self.current_batch_index
-            
-            # Set batch data and start processing
-            self.automation_system.set_batch_data(batch_data)
-            self.automation_system.start_form_input()
-            
-            self.update_status(f"Processing batch {batch_index + 1}/{len(self.available_batches)}")
-            
-            # Schedule next batch processing (with delay for current batch to complete)
-            self.root.after(5000, self.check_current_batch_completion)
-            
+            for position, (batch_index, batch_data) in enumerate(self._batch_queue):
+                if not self.processing_all_batches:
+                    break
+                
+                self.root.after(0, self._on_batch_started, batch_index, batch_data)
+                
+                # Set batch data and start processing; announcing the batches still queued
+                # keeps the automation run waiting for the next authorization
+                automation_system.set_batch_data(batch_data)
+                automation_system.start_form_input(more_batches=position < len(self._batch_queue) - 1)
+                
+                # Block until the automation signals that this form input finished; the
+                # timeout only notices the run ending or the user stopping the queue
+                while not done_event.wait(timeout=1.0):
+                    if not self.is_running or not self.processing_all_batches:
+                        break
+                
+                if not done_event.is_set():
+                    error = f"Automation stopped before batch {batch_index + 1} was processed"
+                    break
+                if not automation_system.form_input_succeeded:
+                    error = f"Batch {batch_index + 1} failed"
+                    break
+                
+                self.root.after(0, self._on_batch_finished)
+                
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to process batch: {e}")
-            self.complete_all_batches_processing()
-    
-    def check_current_batch_completion(self):
-        """Check if current batch processing is complete"""
-        # This is a simplified check - in a real implementation, you'd want to 
-        # monitor the automation system's state more carefully
-        if self.automation_system and not self.automation_system.form_input_ready:
-            # Current batch might be complete, move to next
-            self.current_batch_index += 1
-            self.process_next_batch()
+            error = f"Failed to process batch: {e}"
+        
+        if error:
+            self.root.after(0, self.abort_all_batches_processing, error)
         else:
-            # Still processing, check again later
-            self.root.after(2000, self.check_current_batch_completion)
+            self.root.after(0, self.complete_all_batches_processing)
+    
+    def _on_batch_started(self, batch_index, batch_data):
+        """Update UI when a queued batch starts processing"""
+        self.current_batch_label.config(text=f"Processing Batch {batch_index + 1} ({len(batch_data)} sets)")
+        self.batch_progress['value'] = self.current_batch_index
+        self.update_status(f"Processing batch {batch_index + 1}/{len(self.available_batches)}")
+    
+    def _on_batch_finished(self):
+        """Advance progress when a queued batch completes"""
+        self.current_batch_index += 1
+        self.batch_progress['value'] = self.current_batch_index
     
     def complete_all_batches_processing(self):
         """Complete all batches processing"""
@@ -1089,6 +1162,15 @@ class EnhancedAutomationGUI:
         self.start_all_batches_button.config(state=tk.NORMAL)
         self.update_status("All selected batches processed successfully")
     
+    def abort_all_batches_processing(self, error_msg):
+        """Stop all batches processing after a batch could not be completed"""
+        self.processing_all_batches = False
+        self.current_batch_label.config(text="Batch processing stopped")
+        if self.is_running:
+            self.start_all_batches_button.config(state=tk.NORMAL)
+        self.update_status(f"Batch processing stopped: {error_msg}")
+        messagebox.showerror("Error", error_msg)
+    
     def on_batch_selection_changed(self, event):
         """Handle batch selection change in single batch mode"""
         self.update_batch_mode()
@@ -3,15 +3,15 @@
 Enhanced GUI Launcher with Action Recording and Playback
 """
 
+import concurrent.futures
 import sys
 import tkinter as tk
 from tkinter import messagebox
-import subprocess
-import pkg_resources
-import importlib.util
 
 def check_dependencies():
     """Check if all required dependencies are installed"""
+    from importlib import metadata
+    
     required_packages = [
         'selenium',
         'pandas', 
@@ -23,18 +23,27 @@ def check_dependencies():
     
     for package in required_packages:
         try:
-            pkg_resources.get_distribution(package)
-        except pkg_resources.DistributionNotFound:
+            metadata.distribution(package)
+        except metadata.PackageNotFoundError:
             missing_packages.append(package)
     
     return missing_packages
 
 def install_dependencies(packages):
-    """Install missing dependencies"""
+    """Install missing dependencies with a single pip invocation"""
+    import os
+    import subprocess
+    
+    command = [
+        sys.executable, "-m", "pip", "install",
+        "--disable-pip-version-check", "--no-input", "--prefer-binary",
+    ]
+    if os.environ.get("VERBOSE"):
+        command.append("-v")
+    
     try:
-        for package in packages:
-            print(f"Installing {package}...")
-            subprocess.check_call([sys.executable, "-m", "pip", "install", package])
+        print(f"Installing {', '.join(packages)}...")
+        subprocess.check_call([*command, *packages])
         return True
     except subprocess.CalledProcessError:
         return False
@@ -76,11 +85,14 @@ def main():
     print("Enhanced Web Form Automation System - GUI Launcher")
     print("=" * 60)
     
-    # Show welcome info
-    show_welcome_info()
-    
-    # Check dependencies
-    missing = check_dependencies()
+    # Check dependencies in the background while the welcome info is shown
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        dependency_check = executor.submit(check_dependencies)
+        
+        # Show welcome info
+        show_welcome_info()
+        
+        missing = dependency_check.result()
     
     if missing:
         print(f"Missing dependencies: {', '.join(missing)}")
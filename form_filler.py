@@ -2,10 +2,14 @@
 Form Filler for Web Form Automation System
 """
 
+import itertools
 import logging
+import re
 from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.wait import WebDriverWait
+from selenium.webdriver.remote.webelement import WebElement
 from selenium.common.exceptions import (
     TimeoutException,
     NoSuchElementException,
@@ -16,7 +20,7 @@ from selenium.common.exceptions import (
     UnexpectedAlertPresentException,
     WebDriverException,
 )
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from config import Config
 from web_driver_manager import WebDriverManager
 from adaptive_wait import AdaptiveWaitManager, TimedOperation
@@ -24,15 +28,607 @@ import time
 
 logger = logging.getLogger(__name__)
 
+_CHECKBOX_PATTERN = Config.CHECKBOX_PATTERNS['standard']
+_VALID_VOTES = frozenset(Config.VALID_VALUES)
+
+def _format_checkbox_name(game_index: int, set_index: int, vote_value: int) -> str:
+    """Format a checkbox name from the configured pattern"""
+    # Correct pattern: chkbox_{set}_{game}_{value} (set and game were swapped!)
+    return _CHECKBOX_PATTERN.format_map({
+        'game': set_index,    # セット番号が最初
+        'set': game_index,    # 試合番号が2番目
+        'value': vote_value
+    })
+
+# Every checkbox name a batch can use, built once at import time and
+# indexed as _NAME_TABLE[game_index][set_index][vote_value] (vote values are 0..2)
+_NAME_TABLE: List[List[List[str]]] = [
+    [
+        [_format_checkbox_name(game_index, set_index, vote_value)
+         for vote_value in range(len(Config.VALID_VALUES))]
+        for set_index in range(Config.MAX_SETS_PER_BATCH)
+    ]
+    for game_index in range(Config.MAX_GAMES_PER_SET)
+]
+
+# Clicks every named checkbox that is not yet checked and verifies the result in
+# a single round-trip. el.click() (rather than setting .checked) keeps the page's
+# own click handlers in the loop. Returns the indices of names that were missing
+# or did not end up checked, plus how many of the other vote boxes for the same
+# cells are checked, so the caller only falls back to per-element verification
+# when something is off.
+_FILL_CHECKBOXES_JS = """
+var names = arguments[0], others = arguments[1], missed = [], stray = 0;
+for (var i = 0; i < names.length; i++) {
+    var el = document.getElementsByName(names[i])[0];
+    if (!el) { missed.push(i); continue; }
+    if (!el.checked) { el.click(); }
+    if (!el.checked) { missed.push(i); }
+}
+for (var j = 0; j < others.length; j++) {
+    var other = document.getElementsByName(others[j])[0];
+    if (other && other.checked) { stray++; }
+}
+return {missed: missed, stray: stray};
+"""
+
+# Asynchronous variant of _FILL_CHECKBOXES_JS for a whole batch. Clicks names in
+# groups of arguments[2] and waits for the next animation frame between groups so
+# the page can run its handlers and flush layout, then reports through the async
+# callback. The 50 ms timer keeps going where frames are throttled (hidden window).
+# Stops at the first name with no element on the page and reports its index as
+# absent, since a missing checkbox means the batch cannot be completed.
+_FILL_CHECKBOXES_ASYNC_JS = """
+var names = arguments[0], others = arguments[1], groupSize = arguments[2];
+var done = arguments[arguments.length - 1], missed = [], i = 0;
+function nextFrame(callback) {
+    var fired = false;
+    function go() { if (!fired) { fired = true; setTimeout(callback, 0); } }
+    requestAnimationFrame(go);
+    setTimeout(go, 50);
+}
+function step() {
+    var end = Math.min(i + groupSize, names.length);
+    for (; i < end; i++) {
+        var el = document.getElementsByName(names[i])[0];
+        if (!el) { done({missed: missed, stray: 0, absent: i}); return; }
+        if (!el.checked) { el.click(); }
+        if (!el.checked) { missed.push(i); }
+    }
+    if (i < names.length) { nextFrame(step); return; }
+    var stray = 0;
+    for (var j = 0; j < others.length; j++) {
+        var other = document.getElementsByName(others[j])[0];
+        if (other && other.checked) { stray++; }
+    }
+    done({missed: missed, stray: stray, absent: -1});
+}
+step();
+"""
+
+# Counts expected boxes that are not checked and other vote boxes that are, without clicking
+_CHECK_CHECKBOXES_JS = """
+var names = arguments[0], others = arguments[1], unchecked = 0, stray = 0;
+for (var i = 0; i < names.length; i++) {
+    var el = document.getElementsByName(names[i])[0];
+    if (!el || !el.checked) { unchecked++; }
+}
+for (var j = 0; j < others.length; j++) {
+    var other = document.getElementsByName(others[j])[0];
+    if (other && other.checked) { stray++; }
+}
+return {unchecked: unchecked, stray: stray};
+"""
+
+# Returns the name of every checkbox on the page in one round-trip
+_CHECKBOX_NAMES_JS = """
+return Array.from(document.querySelectorAll("input[type='checkbox']")).map(function(cb) {
+    return cb.name;
+});
+"""
+
+# Returns the names of all checked checkboxes in one round-trip
+_CHECKED_NAMES_JS = """
+return Array.from(document.querySelectorAll("input[type='checkbox']:checked")).map(function(el) {
+    return el.name;
+});
+"""
+
+# Returns page and checkbox status in one round-trip
+_PAGE_STATUS_JS = """
+return {
+    title: document.title,
+    url: location.href,
+    ready: document.readyState,
+    total: document.querySelectorAll("input[type='checkbox']").length,
+    checked: document.querySelectorAll("input[type='checkbox']:checked").length
+};
+"""
+
+# Returns the document's readyState and [name, element, checked] for every checkbox
+# on the page in one round-trip
+_INDEX_CHECKBOXES_JS = """
+return {
+    ready: document.readyState,
+    boxes: Array.from(document.querySelectorAll("input[type='checkbox']")).map(function(el) {
+        return [el.name, el, el.checked];
+    })
+};
+"""
+
+# Scrolls to the bottom and calls back as soon as a cart button is in the DOM,
+# re-scrolling whenever the page grows (lazy-loaded content) and giving up after
+# `timeoutMs`. Calls back with whether a button was seen and the final geometry.
+_SCROLL_TO_CART_BUTTON_JS = """
+var selector = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+var observer = null, timer = null, finished = false;
+function scrollToBottom() {
+    window.scrollTo(0, document.body.scrollHeight);
+    document.documentElement.scrollTop = document.documentElement.scrollHeight;
+}
+function finish(found) {
+    if (finished) return;
+    finished = true;
+    if (observer) observer.disconnect();
+    if (timer) clearTimeout(timer);
+    done({found: found, height: document.body.scrollHeight, position: window.pageYOffset});
+}
+scrollToBottom();
+if (document.querySelector(selector)) { finish(true); return; }
+observer = new MutationObserver(function() {
+    scrollToBottom();
+    if (document.querySelector(selector)) finish(true);
+});
+observer.observe(document.body, {childList: true, subtree: true});
+timer = setTimeout(function() { finish(false); }, timeoutMs);
+"""
+
+# Scrolls past the bottom `steps` times, pausing `pauseMs` between steps so
+# lazily loaded content can render, then settles at the very bottom. Calls back
+# with the start and final heights, the final scroll position, and the heights
+# at which the page grew.
+_SCROLL_IN_STEPS_JS = """
+var steps = arguments[0], pauseMs = arguments[1], done = arguments[arguments.length - 1];
+var initial = document.body.scrollHeight, grew = [], step = 0;
+function next() {
+    if (step++ >= steps) {
+        var height = document.body.scrollHeight;
+        window.scrollTo(0, height);
+        document.documentElement.scrollTop = document.documentElement.scrollHeight;
+        done({initial: initial, height: height, position: window.pageYOffset, grew: grew});
+        return;
+    }
+    var before = document.body.scrollHeight;
+    window.scrollTo(0, before + 100);
+    setTimeout(function() {
+        if (document.body.scrollHeight > before) grew.push(document.body.scrollHeight);
+        next();
+    }, pauseMs);
+}
+next();
+"""
+
+# The site's own add-to-cart button class, tried before the broad scan below
+_CART_BUTTON_SELECTOR = ".kounyu_cart_multiline_base"
+# Any element the cart button area renders, used to tell when scrolling has loaded it
+_CART_RENDERED_SELECTOR = ".kounyu_cart_multiline_base, [class*='kounyu']"
+
+# Selectors scanned for cart/submit button candidates, in priority order
+_CLICKABLE_SELECTORS = [
+    "button, input[type='submit'], input[type='button']",
+    "a[href], div[onclick], span[onclick]",
+    "span, div, a",  # Include all spans and divs
+    "*[onclick]",
+    "input[type='image']",
+    ".btn, .button, .cart, .add",
+    _CART_BUTTON_SELECTOR,  # Specific cart button class
+    "*[class*='kounyu']",
+    "*[class*='cart']"
+]
+
+# Confirmation (OK/はい/確認) buttons looked for after the cart button, in priority order
+_CONFIRMATION_SELECTORS = [
+    "//button[contains(text(), 'OK')]",
+    "//button[contains(text(), 'はい')]",
+    "//button[contains(text(), '確認')]",
+    "//button[contains(text(), 'ok')]",
+    "//input[@value='OK']",
+    "//input[@value='はい']",
+    "//input[@value='確認']",
+    "//button[@value='OK']",
+    "//button[@value='はい']",
+    "//button[@value='確認']",
+    "button[onclick*='ok']",
+    "button[onclick*='OK']",
+    "button[onclick*='confirm']",
+    ".modal button",
+    ".dialog button",
+    ".popup button",
+    "[role='dialog'] button",
+    ".confirm-button",
+    ".ok-button",
+    "*[data-action='confirm']",
+    "*[data-action='ok']"
+]
+
+# Cart candidate scoring. Each text tier contains the next one down, so the weight
+# of the longest match equals the old cumulative 100 + 80 + 60 substring scoring.
+_CART_TEXT_RE = re.compile('購入カートに追加|カートに追加|追加')
+_CART_TEXT_WEIGHTS = {'購入カートに追加': 240, 'カートに追加': 140, '追加': 60}
+_CART_CLASS_RE = re.compile('kounyu_cart')
+_CART_ONCLICK_RE = re.compile('cart|add')
+
+# Lowercased texts of delete/cancel/close controls a confirmation click must skip
+_AVOID_KEYWORDS = frozenset(('削除', 'delete', '取消', 'cancel', '×', 'close', '閉じる', 'キャンセル'))
+
+# XPath fallbacks for the add-to-cart button, most specific first
+_CART_XPATHS = [
+    "//span[contains(@class, 'kounyu_cart_multiline_base')]",
+    "//span[contains(text(), '購入カートに追加')]",
+    "//*[contains(@class, 'kounyu_cart')]",
+    "//div[contains(text(), '購入カートに追加')]",
+    "//a[contains(text(), '購入カートに追加')]",
+    "//input[contains(@value, 'カートに追加')]",
+    "//input[contains(@value, '購入カートに追加')]",
+    "//input[contains(@value, '追加')]",
+    "//button[contains(text(), 'カートに追加')]",
+    "//button[contains(text(), '購入カートに追加')]",
+    "//button[contains(text(), '追加')]",
+    "//span[contains(text(), 'カート')]",
+    "//span[contains(text(), '追加')]",
+    "//input[@type='submit' and contains(@value, 'カート')]",
+    "//input[@type='button' and contains(@value, 'カート')]",
+    "//button[@type='submit' and contains(text(), 'カート')]",
+    "//button[@type='button' and contains(text(), 'カート')]",
+    "//*[contains(@onclick, 'cart') or contains(@onclick, 'Cart')]",
+    "//*[contains(@onclick, 'add') or contains(@onclick, 'Add')]"
+]
+
+# Links back to the voting page after a cart addition. The specific
+# "totoの投票を追加する" buttons come first to avoid wrong redirects.
+_VOTING_PAGE_RETURN_LINKS = [
+    "//*[contains(@class, 'c-clubtoto-btn-base__text') and contains(text(), 'totoの投票を追加する')]",
+    "//button[contains(text(), 'totoの投票を追加する')]",
+    "//a[contains(text(), 'totoの投票を追加する')]",
+    "//p[contains(text(), 'totoの投票を追加する')]",
+    "//img[@id='select_single' or @name='select_single']",  # Single button for next batch
+    "//a[contains(@href, 'PGSPSL00001MoveSingleVoteSheet')]",
+    "//a[contains(text(), '続けて購入')]",
+    "//a[contains(text(), '投票を追加')]",
+    "//a[contains(text(), '投票')]",
+    "//a[contains(text(), '予想')]",
+    # Removed generic "toto" and breadcrumb links to avoid wrong redirects
+]
+
+# Links to the voting page from an arbitrary page
+_VOTING_PAGE_LINKS = [
+    "//a[contains(@href, 'PGSPSL00001MoveSingleVoteSheet')]",
+    "//a[contains(text(), '投票')]",
+    "//a[contains(text(), '予想')]",
+    "//button[contains(text(), '投票')]",
+    "//button[contains(text(), '予想')]"
+]
+
+# URL classifiers for the page reached after cart addition
+_CART_URL_RE = re.compile(r'cart|confirm|index\.html', re.IGNORECASE)
+_VOTING_URL_RE = re.compile(r'PGSPSL00001MoveSingleVoteSheet\.form')
+
+# href fragments of cart-page links that lead to confirmation/result pages
+_BAD_RETURN_URLS = ('confirm', 'result', 'vote/confirm')
+
+# Seconds a browser liveness probe is reused by consecutive checks
+_ALIVE_CACHE_TTL = 0.5
+
+# Texts that mark a view/confirm-cart control rather than an add-to-cart button
+_NEGATIVE_CART_TEXTS = [
+    '購入カートを確認', 'カートを確認', 'カート確認', '確認', '確認する', 'view', 'チェック', '確認へ'
+]
+_NEGATIVE_CART_RE = re.compile('|'.join(map(re.escape, _NEGATIVE_CART_TEXTS)))
+
+# Defines match(selector): selectors starting with "/" are XPath, the rest CSS
+_MATCH_SELECTOR_JS = """
+function match(selector) {
+    if (selector.charAt(0) !== '/') return document.querySelectorAll(selector);
+    var snapshot = document.evaluate(selector, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    var nodes = [];
+    for (var i = 0; i < snapshot.snapshotLength; i++) nodes.push(snapshot.snapshotItem(i));
+    return nodes;
+}
+"""
+
+# Runs every selector in order and de-duplicates the matches in the browser,
+# leaving the total unique count in `seen.size` and the first `limit` elements
+# in `elements`. A single union selector would return document order and lose
+# the priority order of the list, so the selectors are still applied one at a time.
+_COLLECT_CLICKABLES_PRELUDE_JS = _MATCH_SELECTOR_JS + """
+var selectors = arguments[0], limit = arguments[1];
+var seen = new Set(), elements = [];
+selectors.forEach(function(selector) {
+    var found;
+    try { found = match(selector); } catch (e) { return; }
+    for (var i = 0; i < found.length; i++) {
+        if (seen.has(found[i])) continue;
+        seen.add(found[i]);
+        if (elements.length < limit) elements.push(found[i]);
+    }
+});
+"""
+
+# Returns each selector's matches as a separate list, in one round-trip
+_MATCHES_BY_SELECTOR_JS = _MATCH_SELECTOR_JS + """
+return arguments[0].map(function(selector) {
+    try { return Array.prototype.slice.call(match(selector)); } catch (e) { return []; }
+});
+"""
+
+_COLLECT_CLICKABLES_JS = _COLLECT_CLICKABLES_PRELUDE_JS + """
+return {total: seen.size, elements: elements};
+"""
+
+# Collects the clickables and applies the cart-button test in the same call, so
+# only matching elements come back: [index, element, text, class, visible,
+# enabled]. Mirrors FormFiller._is_cart_button, which the fallback path uses.
+_CART_CANDIDATES_JS = _COLLECT_CLICKABLES_PRELUDE_JS + """
+var negatives = arguments[2], candidates = [];
+elements.forEach(function(el, index) {
+    var text = el.getAttribute('value') || (el.innerText || '').trim() || 'no-text';
+    var cls = (el.getAttribute('class') || '').toLowerCase();
+    var onclick = (el.getAttribute('onclick') || '').toLowerCase();
+    var id = (el.getAttribute('id') || '').toLowerCase();
+    var name = (el.getAttribute('name') || '').toLowerCase();
+    var looksLikeCart = /追加|カート|購入|申込/.test(text) ||
+        /kounyu|cart|add|buy|purchase/.test(cls) ||
+        /cart|add|buy|purchase/.test(onclick) ||
+        /cart|add|buy|purchase/.test(id) ||
+        /cart|add/.test(name);
+    // Exclude header navigation cart buttons and confirm/view-cart variants
+    if (!looksLikeCart || /header|nav/.test(cls)) return;
+    if (negatives.some(function(neg) { return text.indexOf(neg) >= 0; })) return;
+    candidates.push([
+        index, el, text, el.getAttribute('class') || 'no-class',
+        !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length),
+        !el.disabled
+    ]);
+});
+return {total: seen.size, candidates: candidates};
+"""
+
+# Collects the confirmation selectors' matches and keeps the visible, enabled
+# ones whose lowercased text has none of the avoid keywords, as [element, text]
+# in selector priority order. Mirrors FormFiller._find_confirmation_buttons'
+# fallback path.
+_CONFIRMATION_BUTTONS_JS = _COLLECT_CLICKABLES_PRELUDE_JS + """
+var avoid = arguments[2];
+return elements.filter(function(el) {
+    if (el.disabled || !(el.offsetWidth || el.offsetHeight || el.getClientRects().length)) return false;
+    if (window.getComputedStyle(el).visibility === 'hidden') return false;
+    var text = (el.getAttribute('value') || (el.innerText || '').trim() || 'no-text').toLowerCase();
+    return !avoid.some(function(keyword) { return text.indexOf(keyword) >= 0; });
+}).map(function(el) {
+    return [el, el.getAttribute('value') || (el.innerText || '').trim() || 'no-text'];
+});
+"""
+
+# Elements the last-resort JavaScript cart click considers: anything whose class,
+# id or onclick mentions the cart, plus the clickable tags that can carry a cart
+# label as text or value. Replaces a scan of document.querySelectorAll('*'),
+# which also matched <html> and <body> through their textContent.
+_JS_CART_CLICK_SELECTOR = ", ".join([
+    "[class*='kounyu_cart']", "[class*='cart' i]", "[class*='add' i]",
+    "[id*='cart' i]", "[id*='add' i]", "[onclick*='cart' i]", "[onclick*='add' i]",
+    "button", "input[type='submit']", "input[type='button']", "a", "span"
+])
+
+# Clicks the first candidate whose text or attributes look like the cart button,
+# skipping view/confirm-cart texts. Returns a description of what was clicked or
+# 'not found'.
+_JS_CART_CLICK_JS = """
+var elements = document.querySelectorAll(arguments[0]), negatives = arguments[1];
+for (var i = 0; i < elements.length; i++) {
+    var elem = elements[i];
+    var text = elem.value || (elem.innerText || '').trim();
+    var onclick = (elem.getAttribute('onclick') || '').toLowerCase();
+    var className = elem.getAttribute('class') || '';
+    var lowerClass = className.toLowerCase();
+    var id = (elem.id || '').toLowerCase();
+    if (negatives.some(function(neg) { return text.indexOf(neg) >= 0; })) continue;
+    if (text.indexOf('追加') >= 0 || text.indexOf('カート') >= 0 ||
+        lowerClass.indexOf('kounyu_cart') >= 0 ||
+        onclick.indexOf('cart') >= 0 || onclick.indexOf('add') >= 0 ||
+        lowerClass.indexOf('cart') >= 0 || lowerClass.indexOf('add') >= 0 ||
+        id.indexOf('cart') >= 0 || id.indexOf('add') >= 0) {
+        try {
+            elem.click();
+            return 'clicked: ' + text + ' (class: ' + className + ')';
+        } catch (e) {
+            console.log('Click failed for element:', e);
+        }
+    }
+}
+return 'not found';
+"""
+
+# Runs the cart search over the site's cart button class first and over every
+# clickable selector only when that finds nothing, in one call. Returns the
+# __cartCandidates result plus whether the narrow search was enough.
+_CART_SEARCH_JS = """
+var preferred = arguments[0], selectors = arguments[1], limit = arguments[2], negatives = arguments[3];
+var found = window.__cartCandidates([preferred], limit, negatives);
+found.preferred = found.candidates.length > 0;
+return found.preferred ? found : Object.assign(window.__cartCandidates(selectors, limit, negatives), {preferred: false});
+"""
+
+# Scrolls until the cart button renders, hides overlays and runs the cart search
+# in one async call, so submit_form needs a single round-trip before clicking.
+# Arguments: rendered selector, timeout (ms), then the __cartSearch arguments.
+_PREPARE_CART_CLICK_JS = """
+var args = Array.prototype.slice.call(arguments), done = args.pop();
+window.__scrollToCartButton(args[0], args[1], function(scrolled) {
+    var hidden = window.__hideOverlays();
+    done({scroll: scrolled, hidden: hidden, search: window.__cartSearch.apply(null, args.slice(2))});
+});
+"""
+
+# Hides modal/popup/overlay layers with non-destructive style overrides and
+# returns how many were hidden. The selector list is joined once, here; the
+# class substring matches also cover .modal, .modal-backdrop, .popup and
+# .overlay. Each element gets one cssText write instead of four setProperty calls.
+_OVERLAY_SELECTOR = ", ".join([
+    '[aria-modal="true"]', '[role="dialog"]',
+    '[class*="modal"]', '[class*="popup"]', '[class*="overlay"]'
+])
+_HIDE_OVERLAYS_JS = """
+var count = 0;
+var nodes = document.querySelectorAll('%s');
+for (var i = 0; i < nodes.length; i++) {
+    try {
+        nodes[i].style.cssText += ';display:none !important;visibility:hidden !important;' +
+            'pointer-events:none !important;opacity:0 !important;';
+        count++;
+    } catch (e) {}
+}
+try { document.body.style.setProperty('overflow', 'auto', 'important'); } catch (e) {}
+return count;
+""" % _OVERLAY_SELECTOR
+
+# Scrolls an element to the middle of the viewport and reports whether a click
+# there would reach it: enabled, laid out, not visibility:hidden and not covered
+# by another element at its centre
+_SCROLL_INTO_VIEW_IF_CLICKABLE_JS = """
+var el = arguments[0];
+el.scrollIntoView({behavior: 'instant', block: 'center'});
+if (el.disabled || window.getComputedStyle(el).visibility === 'hidden') return false;
+var rect = el.getBoundingClientRect();
+if (!(rect.width || rect.height)) return false;
+var hit = document.elementFromPoint(rect.left + rect.width / 2, rect.top + rect.height / 2);
+return !!hit && (hit === el || el.contains(hit));
+"""
+
+# Returns the first of arguments[0] found in the page markup (the same markup
+# page_source would ship over the wire), or null
+_PAGE_CONTAINS_JS = """
+var html = document.documentElement.outerHTML;
+if (arguments[1]) html = html.toLowerCase();
+for (var i = 0; i < arguments[0].length; i++) {
+    if (html.indexOf(arguments[0][i]) >= 0) return arguments[0][i];
+}
+return null;
+"""
+
+# Reads [text, onclick, class, id, name, visible, enabled] for each element in
+# one round-trip. "visible" is a layout-box plus computed-visibility check, a
+# cheap stand-in for WebElement.is_displayed used to pre-filter click candidates
+# (the click paths still wait for clickability before a native click).
+_CLICKABLE_ATTRIBUTES_JS = """
+return arguments[0].map(function(el) {
+    return [
+        el.getAttribute('value') || (el.innerText || '').trim(),
+        el.getAttribute('onclick') || '',
+        el.getAttribute('class') || '',
+        el.getAttribute('id') || '',
+        el.getAttribute('name') || '',
+        !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length) &&
+            window.getComputedStyle(el).visibility !== 'hidden',
+        !el.disabled
+    ];
+});
+"""
+
+# Same visibility rules for links, with the resolved href instead of onclick/class
+_LINK_ATTRIBUTES_JS = """
+return arguments[0].map(function(el) {
+    return [
+        (el.innerText || '').trim(),
+        el.href || el.getAttribute('href') || '',
+        el.getAttribute('id') || '',
+        el.getAttribute('name') || '',
+        !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length) &&
+            window.getComputedStyle(el).visibility !== 'hidden',
+        !el.disabled
+    ];
+});
+"""
+
+# Helpers installed on window once per page so hot-path calls only send their arguments
+_PAGE_HELPERS = {
+    '__fillCheckboxes': _FILL_CHECKBOXES_JS,
+    '__fillCheckboxesAsync': _FILL_CHECKBOXES_ASYNC_JS,
+    '__checkCheckboxes': _CHECK_CHECKBOXES_JS,
+    '__checkboxNames': _CHECKBOX_NAMES_JS,
+    '__checkedNames': _CHECKED_NAMES_JS,
+    '__statusSnapshot': _PAGE_STATUS_JS,
+    '__hideOverlays': _HIDE_OVERLAYS_JS,
+    '__cartCandidates': _CART_CANDIDATES_JS,
+    '__cartSearch': _CART_SEARCH_JS,
+    '__scrollToCartButton': _SCROLL_TO_CART_BUTTON_JS,
+    '__prepareCartClick': _PREPARE_CART_CLICK_JS,
+    '__confirmationButtons': _CONFIRMATION_BUTTONS_JS,
+}
+_INSTALL_HELPERS_JS = "".join(
+    f"window.{helper} = function() {{{body}}};\n" for helper, body in _PAGE_HELPERS.items()
+)
+
+# Calls an installed helper; returns null when the page has been reloaded since install
+_CALL_HELPER_JS = """
+var helper = window[arguments[0]];
+return helper ? [helper.apply(null, Array.prototype.slice.call(arguments, 1))] : null;
+"""
+
+# Async counterpart of _CALL_HELPER_JS; the helper reports through its last argument
+_CALL_ASYNC_HELPER_JS = """
+var args = Array.prototype.slice.call(arguments), done = args.pop(), helper = window[args.shift()];
+if (!helper) { done(null); return; }
+args.push(function(result) { done([result]); });
+helper.apply(null, args);
+"""
+
 class FormFiller:
     """Handles form filling operations with checkbox interactions"""
 
+    # CSV values to voting page values
+    # CSV: 1=ホーム勝ち, 0=引き分け, 2=アウェイ勝ち
+    # Page: 0=ホーム勝ち, 1=引き分け, 2=アウェイ勝ち
+    _CSV_TO_VOTE = {1: 0, 0: 1, 2: 2}
+
     def __init__(self, webdriver_manager: WebDriverManager):
         self.driver_manager = webdriver_manager
         self.driver = webdriver_manager.driver
         self.wait = webdriver_manager.wait
+        # Short, tightly polled wait for checkbox clicks; self.wait stays the long-poll page wait
+        self._fast_wait = WebDriverWait(self.driver, timeout=2, poll_frequency=0.05)
         self.adaptive_wait = AdaptiveWaitManager(max_history=20)
+        self._checkbox_cache: Dict[str, WebElement] = {}
+        # Last known checked state per checkbox name, from bulk reads and our own clicks
+        self._checkbox_state: Dict[str, bool] = {}
+        self._skip_clickable_wait = False
+        self._debug_dumps = 0
+        # (monotonic timestamp, result) of the last browser liveness probe
+        self._alive_cache: Tuple[float, bool] = (float('-inf'), False)
+        # DevTools dialog handling is only available on Chromium drivers (Chrome/Edge)
+        self._cdp_dialogs = self._enable_cdp_page_domain()
+        
+        # Resolve the configured selector lists once
+        self._submit_sel = Config.SELECTORS['submit_button']
+        self._cart_sel = Config.SELECTORS['cart_button']
+        self._next_sel = Config.SELECTORS['next_button']
+        self._confirm_sel = Config.SELECTORS['confirm_checkbox']
         
+    def _enable_cdp_page_domain(self) -> bool:
+        """
+        Enable the DevTools Page domain so JavaScript dialogs can be answered over CDP
+        
+        Returns:
+            bool: True if the driver accepted Page.enable, False otherwise
+        """
+        if not hasattr(self.driver, 'execute_cdp_cmd'):
+            return False
+        try:
+            self.driver.execute_cdp_cmd('Page.enable', {})
+            return True
+        except WebDriverException as e:
+            logger.debug(f"DevTools Page domain unavailable: {e}")
+            return False
+    
     def fill_voting_form(self, batch_data: List[List[int]]) -> bool:
         """
         Fill voting form with batch data
@@ -43,9 +639,15 @@ class FormFiller:
         Returns:
             bool: True if successful, False otherwise
         """
+        previous_implicit_wait = None
         try:
             logger.info(f"Filling form with {len(batch_data)} sets")
             
+            # Every checkbox is expected to exist, so a miss should fail fast rather than
+            # sit out the implicit wait once per fallback selector
+            previous_implicit_wait = self.driver.timeouts.implicit_wait
+            self.driver.implicitly_wait(0)
+            
             # Process by games (rows) first, then sets (columns)
             num_games = Config.MAX_GAMES_PER_SET
             num_sets = len(batch_data)
@@ -53,48 +655,95 @@ class FormFiller:
             logger.info(f"Configuration: MAX_GAMES_PER_SET = {num_games}, batch contains {num_sets} sets")
             logger.info(f"Will process games 0 to {num_games-1} (total: {num_games} games)")
             
-            for game_index in range(num_games):
-                logger.info(f"Processing game {game_index + 1}/{num_games}")
-                
-                for set_index in range(num_sets):
-                    if set_index >= Config.MAX_SETS_PER_BATCH:
-                        logger.warning(f"Reached maximum sets per batch ({Config.MAX_SETS_PER_BATCH})")
-                        break
-                    
-                    # CSV: rows=sets, columns=games | Form: rows=games, columns=sets
-                    # batch_data[set_index] = one CSV row (one set's 13 game values)
-                    # We need: batch_data[set_index][game_index] but only for first 10 games
-                    if game_index >= len(batch_data[set_index]):
-                        logger.error(f"CSV doesn't have game {game_index + 1} (only {len(batch_data[set_index])} games)")
-                        return False
-                    
-                    # Form supports 13 games as user confirmed
-                        
-                    csv_value = batch_data[set_index][game_index]
-                    
-                    # Convert CSV values to voting page values
-                    # CSV: 1=ホーム勝ち, 0=引き分け, 2=アウェイ勝ち  
-                    # Page: 0=ホーム勝ち, 1=引き分け, 2=アウェイ勝ち
-                    if csv_value == 1:
-                        vote_value = 0  # ホーム勝ち
-                    elif csv_value == 0:
-                        vote_value = 1  # 引き分け
-                    elif csv_value == 2:
-                        vote_value = 2  # アウェイ勝ち
-                    else:
-                        logger.error(f"Invalid CSV value: {csv_value}, expected 0, 1, or 2")
-                        return False
-                    
-                    success = self._click_checkbox(game_index, set_index, vote_value)
-                    if not success:
-                        logger.error(f"Failed to click checkbox for game {game_index + 1}, set {set_index + 1}, value {vote_value}")
-                        return False
-                    # No delay needed - _safe_click_checkbox now verifies reflection
-                
-                logger.info(f"Successfully filled game {game_index + 1}")
+            if num_sets > Config.MAX_SETS_PER_BATCH:
+                logger.warning(f"Reached maximum sets per batch ({Config.MAX_SETS_PER_BATCH})")
+                num_sets = Config.MAX_SETS_PER_BATCH
+            
+            # CSV: rows=sets, columns=games | Form: rows=games, columns=sets
+            # batch_data[set_index] = one CSV row (one set's 13 game values)
+            # Validate shape and values once so building the plan needs no per-cell checks
+            sets = batch_data[:num_sets]
+            for row in sets:
+                if len(row) < num_games:
+                    logger.error(f"CSV doesn't have game {len(row) + 1} (only {len(row)} games)")
+                    return False
+            
+            invalid_values = {value for row in sets for value in row[:num_games]} - self._CSV_TO_VOTE.keys()
+            if invalid_values:
+                logger.error(f"Invalid CSV values: {sorted(invalid_values, key=str)}, expected 0, 1, or 2")
+                return False
+            
+            # Index this page's checkboxes so fallback clicks and verification skip per-name lookups
+            self._prime_checkbox_cache()
+            self._debug_dumps = 0
+            
+            # Resolve every (game, set, vote) to click, and the names that must stay
+            # unchecked, in one pass over the name table before touching the browser
+            plan, names, others = [], [], []
+            for game_index, set_index in itertools.product(range(num_games), range(num_sets)):
+                vote_value = self._CSV_TO_VOTE[sets[set_index][game_index]]
+                cell_names = _NAME_TABLE[game_index][set_index]
+                plan.append((game_index, set_index, vote_value))
+                names.append(cell_names[vote_value])
+                others.extend(name for v, name in enumerate(cell_names) if v != vote_value)
+            
+            # Click and verify the whole batch inside the browser in one async call,
+            # yielding to the page after each game row
+            try:
+                result = self._call_async_helper('__fillCheckboxesAsync', names, others, num_sets)
+                missed, stray = result['missed'], result['stray']
+                # Record what the pass left checked so per-element retries can skip their pre-click probe
+                self._checkbox_state.update(dict.fromkeys(names, True))
+                self._checkbox_state.update((names[i], False) for i in missed)
+            except WebDriverException as e:
+                logger.warning(f"Batched checkbox fill failed, clicking individually: {e}")
+                missed, stray = range(len(plan)), None
+                # The script may have clicked some boxes before failing
+                for name in names:
+                    self._checkbox_state.pop(name, None)
+            
+            # A checkbox missing from the page fails the batch: stop before any more driver calls
+            if stray is not None and result['absent'] >= 0:
+                game_index, set_index, vote_value = plan[result['absent']]
+                logger.error(f"Checkbox not found: {names[result['absent']]}")
+                self._debug_page_elements(game_index, set_index, vote_value)
+                return False
+            logger.info(f"Batched fill selected {len(plan) - len(missed)}/{len(plan)} checkboxes")
+            
+            # Give anything the first pass missed a second in-browser pass
+            if missed:
+                retry_names = [names[i] for i in missed]
+                try:
+                    second = self._call_helper('__fillCheckboxes', retry_names, [])
+                    missed = [missed[i] for i in second['missed']]
+                    self._checkbox_state.update(dict.fromkeys(retry_names, True))
+                    self._checkbox_state.update((retry_names[i], False) for i in second['missed'])
+                except WebDriverException as e:
+                    logger.debug(f"Second batched pass failed: {e}")
+                    for name in retry_names:
+                        self._checkbox_state.pop(name, None)
+            
+            # Retry what is still missing through the per-element click path; the clicks
+            # are verified together by the single read-back below, not one by one
+            for index in missed:
+                game_index, set_index, vote_value = plan[index]
+                success = self._click_checkbox(game_index, set_index, vote_value, verify=False)
+                if not success:
+                    logger.error(f"Failed to click checkbox for game {game_index + 1}, set {set_index + 1}, value {vote_value}")
+                    return False
             
             logger.info("All games filled successfully")
 
+            # Re-check retried cells with one in-browser count instead of per-element is_selected calls
+            unchecked = 0
+            if missed:
+                unchecked, stray = self._read_checkbox_state(names, others)
+
+            # Fall back to per-element verification only when the in-browser check disagrees
+            if unchecked == 0 and stray == 0:
+                logger.info("Form verification passed: all selections match CSV data")
+                return True
+
             # Verify all selections before returning
             verified, mismatches = self.verify_form_input(batch_data)
             if not verified:
@@ -112,11 +761,35 @@ class FormFiller:
         except Exception as e:
             logger.error(f"Error filling voting form: {e}")
             return False
+        finally:
+            if previous_implicit_wait is not None:
+                try:
+                    self.driver.implicitly_wait(previous_implicit_wait)
+                except WebDriverException as e:
+                    logger.warning(f"Failed to restore implicit wait: {e}")
+    
+    def _read_checkbox_state(self, names: List[str], others: List[str]) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Count unchecked expected boxes and checked non-expected boxes in one round-trip
+        
+        Args:
+            names: Checkbox names that should be checked
+            others: Checkbox names that should not be checked
+            
+        Returns:
+            tuple: (unchecked, stray) counts, or (None, None) if the script failed
+        """
+        try:
+            state = self._call_helper('__checkCheckboxes', names, others)
+            return state['unchecked'], state['stray']
+        except WebDriverException as e:
+            logger.debug(f"In-browser checkbox check failed: {e}")
+            return None, None
     
     def verify_form_input(self, batch_data: List[List[int]]) -> tuple:
         """
         Verify that all form selections match the expected CSV data.
-        Reads back each checkbox's selected state and compares with batch_data.
+        Reads back every checked checkbox in one script call and compares with batch_data.
 
         Returns:
             tuple: (all_match: bool, mismatches: List[dict])
@@ -127,18 +800,19 @@ class FormFiller:
 
         logger.info(f"Verifying form input: {num_games} games × {num_sets} sets")
 
+        try:
+            checked_names = set(self._call_helper('__checkedNames'))
+        except WebDriverException as e:
+            logger.warning(f"Verify error reading checked boxes: {e}")
+            checked_names, read_error = None, str(e)
+
         for game_index in range(num_games):
             for set_index in range(num_sets):
                 csv_value = batch_data[set_index][game_index]
 
                 # CSV→vote conversion (same as fill_voting_form)
-                if csv_value == 1:
-                    expected_vote = 0
-                elif csv_value == 0:
-                    expected_vote = 1
-                elif csv_value == 2:
-                    expected_vote = 2
-                else:
+                expected_vote = self._CSV_TO_VOTE.get(csv_value)
+                if expected_vote is None:
                     mismatches.append({
                         'game': game_index, 'set': set_index,
                         'expected_csv': csv_value, 'expected_vote': None,
@@ -146,46 +820,36 @@ class FormFiller:
                     })
                     continue
 
-                # Check if the expected checkbox is selected
-                expected_name = self._get_checkbox_name(game_index, set_index, expected_vote)
-                try:
-                    expected_elem = self._find_checkbox_by_name(expected_name)
-                    if expected_elem and expected_elem.is_selected():
-                        continue  # Match confirmed
-
-                    # Expected not selected — find what IS selected
-                    actual_vote = None
-                    for v in [0, 1, 2]:
-                        if v == expected_vote:
-                            continue
-                        name = self._get_checkbox_name(game_index, set_index, v)
-                        try:
-                            elem = self._find_checkbox_by_name(name)
-                            if elem and elem.is_selected():
-                                actual_vote = v
-                                break
-                        except (NoSuchElementException, StaleElementReferenceException):
-                            continue
-
+                if checked_names is None:
                     mismatches.append({
                         'game': game_index, 'set': set_index,
                         'expected_csv': csv_value, 'expected_vote': expected_vote,
-                        'actual_vote': actual_vote,
-                        'error': 'selection mismatch'
+                        'actual_vote': None, 'error': read_error
                     })
-                    logger.warning(
-                        f"Mismatch: game {game_index+1}, set {set_index+1} — "
-                        f"expected vote={expected_vote} (CSV={csv_value}), "
-                        f"actual vote={actual_vote}"
-                    )
+                    continue
 
-                except (StaleElementReferenceException, WebDriverException) as e:
-                    mismatches.append({
-                        'game': game_index, 'set': set_index,
-                        'expected_csv': csv_value, 'expected_vote': expected_vote,
-                        'actual_vote': None, 'error': str(e)
-                    })
-                    logger.warning(f"Verify error at game {game_index+1}, set {set_index+1}: {e}")
+                # Check if the expected checkbox is selected
+                if self._get_checkbox_name(game_index, set_index, expected_vote) in checked_names:
+                    continue  # Match confirmed
+
+                # Expected not selected — find what IS selected
+                actual_vote = None
+                for v in Config.VALID_VALUES:
+                    if v != expected_vote and self._get_checkbox_name(game_index, set_index, v) in checked_names:
+                        actual_vote = v
+                        break
+
+                mismatches.append({
+                    'game': game_index, 'set': set_index,
+                    'expected_csv': csv_value, 'expected_vote': expected_vote,
+                    'actual_vote': actual_vote,
+                    'error': 'selection mismatch'
+                })
+                logger.warning(
+                    f"Mismatch: game {game_index+1}, set {set_index+1} — "
+                    f"expected vote={expected_vote} (CSV={csv_value}), "
+                    f"actual vote={actual_vote}"
+                )
 
         if mismatches:
             logger.warning(f"Verification result: {len(mismatches)} mismatches found out of {num_games * num_sets} checks")
@@ -213,7 +877,7 @@ class FormFiller:
                 return False
 
             logger.info(f"Re-clicking game {game_index+1}, set {set_index+1}, vote={expected_vote}")
-            success = self._click_checkbox(game_index, set_index, expected_vote)
+            success = self._click_checkbox(game_index, set_index, expected_vote, verify=False)
             if not success:
                 logger.error(f"Correction failed for game {game_index+1}, set {set_index+1}")
                 return False
@@ -247,25 +911,46 @@ class FormFiller:
                 logger.error(f"Invalid set data length: {len(set_data)}, expected {Config.MAX_GAMES_PER_SET}")
                 return False
             
-            # Process each game (row) for this set (column)
-            for game_index, vote_value in enumerate(set_data):
-                if vote_value not in Config.VALID_VALUES:
-                    logger.error(f"Invalid vote value: {vote_value}, expected one of {Config.VALID_VALUES}")
-                    return False
-                
-                success = self._click_checkbox(game_index, set_index, vote_value)
-                if not success:
-                    logger.error(f"Failed to click checkbox for game {game_index + 1}, set {set_index + 1}, value {vote_value}")
-                    return False
-                # No delay needed - _safe_click_checkbox now verifies reflection
+            if not _VALID_VOTES.issuperset(set_data):
+                invalid = sorted(set(set_data) - _VALID_VOTES, key=str)
+                logger.error(f"Invalid vote values: {invalid}, expected one of {Config.VALID_VALUES}")
+                return False
             
-            return True
+            return self._fill_single_set_js(set_data, set_index)
             
         except Exception as e:
             logger.error(f"Error filling single set: {e}")
             return False
     
-    def _click_checkbox(self, game_index: int, set_index: int, vote_value: int) -> bool:
+    def _fill_single_set_js(self, set_data: List[int], set_index: int) -> bool:
+        """
+        Click all of one set's checkboxes in a single script call
+        
+        Args:
+            set_data: List of 13 validated vote values (0, 1, or 2)
+            set_index: Index of the current set (0-based)
+            
+        Returns:
+            bool: True if every checkbox ended up selected, False otherwise
+        """
+        names = [self._get_checkbox_name(game_index, set_index, vote_value)
+                 for game_index, vote_value in enumerate(set_data)]
+        try:
+            missed = self._call_helper('__fillCheckboxes', names, [])['missed']
+        except WebDriverException as e:
+            logger.warning(f"Batched set fill failed, clicking individually: {e}")
+            missed = range(len(names))
+        
+        # Retry anything the batched pass missed through the per-element click path
+        for game_index in missed:
+            vote_value = set_data[game_index]
+            if not self._click_checkbox(game_index, set_index, vote_value):
+                logger.error(f"Failed to click checkbox for game {game_index + 1}, set {set_index + 1}, value {vote_value}")
+                return False
+        
+        return True
+    
+    def _click_checkbox(self, game_index: int, set_index: int, vote_value: int, verify: bool = True) -> bool:
         """
         Click a specific checkbox based on game, set, and vote value
         
@@ -273,6 +958,7 @@ class FormFiller:
             game_index: Game index (0-12)
             set_index: Set index (0-9)
             vote_value: Vote value (0, 1, or 2)
+            verify: Wait for the click to register; callers that re-read the whole form afterwards pass False
             
         Returns:
             bool: True if successful, False otherwise
@@ -290,9 +976,10 @@ class FormFiller:
                 return False
             
             # Click the checkbox
-            success = self._safe_click_checkbox(checkbox, checkbox_name)
+            success = self._safe_click_checkbox(checkbox, checkbox_name, verify=verify)
             if success:
-                logger.debug(f"Clicked checkbox: {checkbox_name}")
+                self._checkbox_state[checkbox_name] = True
+                logger.debug("Clicked checkbox: %s", checkbox_name)
             
             return success
             
@@ -312,14 +999,71 @@ class FormFiller:
         Returns:
             str: Checkbox name attribute
         """
-        # Correct pattern: chkbox_{set}_{game}_{value} (set and game were swapped!)
-        return Config.CHECKBOX_PATTERNS['standard'].format(
-            game=set_index,    # セット番号が最初
-            set=game_index,    # 試合番号が2番目  
-            value=vote_value
-        )
+        try:
+            return _NAME_TABLE[game_index][set_index][vote_value]
+        except IndexError:
+            return _format_checkbox_name(game_index, set_index, vote_value)
     
-    def _find_checkbox_by_name(self, checkbox_name: str) -> Optional[object]:
+    def _install_helpers(self):
+        """Define the page helper functions on window for the current page"""
+        self.driver.execute_script(_INSTALL_HELPERS_JS)
+    
+    def _call_helper(self, helper: str, *args):
+        """
+        Call a page helper, installing the helpers first if this page does not have them
+        
+        Args:
+            helper: Helper name from _PAGE_HELPERS
+            *args: Arguments passed to the helper
+            
+        Returns:
+            The helper's return value
+        """
+        result = self.driver.execute_script(_CALL_HELPER_JS, helper, *args)
+        if result is None:
+            self._install_helpers()
+            result = self.driver.execute_script(_CALL_HELPER_JS, helper, *args)
+        return result[0]
+    
+    def _call_async_helper(self, helper: str, *args):
+        """
+        Call an asynchronous page helper, installing the helpers first if this page does not have them
+        
+        Args:
+            helper: Helper name from _PAGE_HELPERS
+            *args: Arguments passed to the helper before its callback
+            
+        Returns:
+            The value the helper passed to its callback
+        """
+        result = self.driver.execute_async_script(_CALL_ASYNC_HELPER_JS, helper, *args)
+        if result is None:
+            self._install_helpers()
+            result = self.driver.execute_async_script(_CALL_ASYNC_HELPER_JS, helper, *args)
+        return result[0]
+    
+    def _invalidate_page_caches(self):
+        """Forget element handles and checkbox state cached for the current page"""
+        self._checkbox_cache = {}
+        self._checkbox_state = {}
+        self._skip_clickable_wait = False
+    
+    def _prime_checkbox_cache(self):
+        """Index every checkbox on the current page by name and install the page helpers in one script call"""
+        try:
+            index = self.driver.execute_script(_INSTALL_HELPERS_JS + _INDEX_CHECKBOXES_JS)
+            self._checkbox_cache = {name: element for name, element, _ in index['boxes'] if name}
+            self._checkbox_state = {name: checked for name, _, checked in index['boxes'] if name}
+            # A fully loaded, freshly indexed form does not need per-click clickable checks
+            self._skip_clickable_wait = index['ready'] == 'complete' and bool(self._checkbox_cache)
+            logger.debug("Indexed %d checkboxes", len(self._checkbox_cache))
+        except WebDriverException as e:
+            logger.debug("Checkbox indexing failed: %s", e)
+            self._checkbox_cache = {}
+            self._checkbox_state = {}
+            self._skip_clickable_wait = False
+    
+    def _find_checkbox_by_name(self, checkbox_name: str) -> Optional[WebElement]:
         """
         Find checkbox element by name attribute
         
@@ -329,40 +1073,33 @@ class FormFiller:
         Returns:
             WebElement if found, None otherwise
         """
-        try:
-            # Primary method: find by name attribute
-            checkbox = self.driver.find_element(By.NAME, checkbox_name)
+        checkbox = self._checkbox_cache.get(checkbox_name)
+        if checkbox is not None:
             return checkbox
-            
-        except NoSuchElementException:
-            # Try alternative selectors
-            alternative_selectors = [
-                f"input[name='{checkbox_name}']",
-                f"input[id='{checkbox_name}']",
-                f"input[type='checkbox'][name='{checkbox_name}']"
-            ]
-            
-            for selector in alternative_selectors:
-                try:
-                    checkbox = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    logger.debug(f"Found checkbox using alternative selector: {selector}")
-                    return checkbox
-                except NoSuchElementException:
-                    continue
-            
-            logger.debug(f"Checkbox not found with any selector: {checkbox_name}")
+        
+        try:
+            # Not in this page's index: one direct lookup (a stale cached handle is
+            # handled by re-indexing in _safe_click_checkbox, not by trying more selectors)
+            matches = self.driver.find_elements(By.NAME, checkbox_name)
+            if matches:
+                self._checkbox_cache[checkbox_name] = matches[0]
+                return matches[0]
+            
+            logger.debug("Checkbox not found: %s", checkbox_name)
             return None
         except Exception as e:
             logger.error(f"Error finding checkbox {checkbox_name}: {e}")
             return None
     
-    def _safe_click_checkbox(self, checkbox_element: object, checkbox_name: str) -> bool:
+    def _safe_click_checkbox(self, checkbox_element: WebElement, checkbox_name: str, verify: bool = True) -> bool:
         """
         Safely click a checkbox element with reflection verification
 
         Args:
             checkbox_element: WebElement to click
-            checkbox_name: Name for logging purposes
+            checkbox_name: Name attribute, used to re-find a stale element and for logging
+            verify: Wait for the element to report selected after the click. Without it a click
+                that raised nothing counts as success and the caller's batched read-back checks it.
 
         Returns:
             bool: True if successful, False otherwise
@@ -370,70 +1107,87 @@ class FormFiller:
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                # Check if checkbox is already selected
-                if checkbox_element.is_selected():
-                    logger.debug(f"Checkbox {checkbox_name} is already selected")
-                    return True
+                # Check if checkbox is already selected (also surfaces a stale cached handle).
+                # A box a bulk read just reported unchecked skips the probe on the first attempt.
+                known_unchecked = attempt == 0 and self._checkbox_state.get(checkbox_name) is False
+                try:
+                    if not known_unchecked and checkbox_element.is_selected():
+                        logger.debug("Checkbox %s is already selected", checkbox_name)
+                        return True
+                except StaleElementReferenceException:
+                    # The page re-rendered since indexing: rebuild the cache and re-find once
+                    logger.debug("Cached checkbox %s is stale, re-indexing page", checkbox_name)
+                    self._prime_checkbox_cache()
+                    checkbox_element = self._find_checkbox_by_name(checkbox_name)
+                    if checkbox_element is None:
+                        logger.error(f"Checkbox not found after re-indexing: {checkbox_name}")
+                        return False
+                    if checkbox_element.is_selected():
+                        return True
 
                 # Time the operation for adaptive wait learning
                 with TimedOperation(self.adaptive_wait, 'click'):
-                    # Scroll element into view first (no sleep, scroll is instant)
-                    try:
-                        self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'instant', block: 'center'});", checkbox_element)
-                    except WebDriverException as e:
-                        logger.debug(f"Scroll failed for {checkbox_name}: {e}")
-
+                    # No explicit scroll: the JavaScript click does not need the element to be
+                    # visible and the native fallback scrolls it into view itself
+                    
                     # Get optimal timeout from adaptive wait manager
                     click_timeout = self.adaptive_wait.get_click_timeout(default=2.0, max_timeout=5.0)
 
-                    # Try direct click first (faster approach)
+                    # Try JavaScript click first (no W3C actions sequence or hit-testing)
                     try:
-                        checkbox_element.click()
-                        logger.debug(f"Direct click initiated for {checkbox_name}")
+                        self.driver.execute_script("arguments[0].click();", checkbox_element)
+                        logger.debug("JavaScript click initiated for %s", checkbox_name)
+                        if not verify:
+                            return True
 
-                        # Wait for checkbox to be selected (with adaptive timeout)
+                        # Wait for selection with adaptive timeout
                         WebDriverWait(self.driver, click_timeout, poll_frequency=0.05).until(
                             lambda d: checkbox_element.is_selected()
                         )
-                        logger.debug(f"Checkbox {checkbox_name} verified as selected")
+                        logger.debug("Checkbox %s verified as selected (JS click)", checkbox_name)
                         return True
 
-                    except ElementClickInterceptedException:
-                        logger.warning(f"Click intercepted for {checkbox_name} (attempt {attempt+1}/{max_retries}) - likely popup")
-                        # Try to close popups then continue to next attempt
-                        self._dismiss_popups_and_overlays_quick()
-                        continue
-                    
                     except TimeoutException:
-                        logger.warning(f"Checkbox {checkbox_name} direct click did not register in time, trying alternatives")
+                        logger.warning(f"Checkbox {checkbox_name} JavaScript click did not register in time, trying native click")
 
-                    except Exception as click_error:
-                        logger.debug(f"Direct click failed for {checkbox_name}: {click_error}")
+                    except Exception as js_error:
+                        logger.debug("JavaScript click failed for %s: %s", checkbox_name, js_error)
 
-                    # Try JavaScript click as fallback
+                    # Fall back to a native click
                     try:
-                        self.driver.execute_script("arguments[0].click();", checkbox_element)
-                        logger.debug(f"JavaScript click initiated for {checkbox_name}")
+                        checkbox_element.click()
+                        logger.debug("Direct click initiated for %s", checkbox_name)
+                        if not verify:
+                            return True
 
-                        # Wait for selection with adaptive timeout
+                        # Wait for checkbox to be selected (with adaptive timeout)
                         WebDriverWait(self.driver, click_timeout, poll_frequency=0.05).until(
                             lambda d: checkbox_element.is_selected()
                         )
-                        logger.debug(f"Checkbox {checkbox_name} verified as selected (JS click)")
+                        logger.debug("Checkbox %s verified as selected", checkbox_name)
                         return True
 
+                    except ElementClickInterceptedException:
+                        logger.warning(f"Click intercepted for {checkbox_name} (attempt {attempt+1}/{max_retries}) - likely popup")
+                        # Try to close popups then continue to next attempt
+                        self._dismiss_popups_and_overlays_quick()
+                        continue
+                    
                     except TimeoutException:
-                        logger.warning(f"Checkbox {checkbox_name} JavaScript click did not register in time")
+                        logger.warning(f"Checkbox {checkbox_name} direct click did not register in time")
                         return False
-                    except Exception as js_error:
-                        logger.debug(f"JavaScript click also failed for {checkbox_name}: {js_error}")
 
-                        # Last resort: try with explicit wait for clickable
+                    except Exception as click_error:
+                        logger.debug("Direct click also failed for %s: %s", checkbox_name, click_error)
+
+                        # Last resort: try with explicit wait for clickable (skipped on a
+                        # freshly indexed, fully loaded form where it is only extra round-trips)
                         try:
-                            WebDriverWait(self.driver, click_timeout, poll_frequency=0.05).until(
-                                EC.element_to_be_clickable(checkbox_element)
-                            )
+                            if not self._skip_clickable_wait:
+                                self._fast_wait.until(EC.element_to_be_clickable(checkbox_element))
                             checkbox_element.click()
+                            if not verify:
+                                return True
 
                             # Verify selection
                             WebDriverWait(self.driver, click_timeout, poll_frequency=0.05).until(
@@ -445,7 +1199,7 @@ class FormFiller:
                             self._dismiss_popups_and_overlays_quick()
                             continue
                         except (TimeoutException, StaleElementReferenceException, WebDriverException) as e:
-                            logger.debug(f"Last resort click failed for {checkbox_name}: {e}")
+                            logger.debug("Last resort click failed for %s: %s", checkbox_name, e)
                             if attempt < max_retries - 1:
                                 continue
                             return False
@@ -477,158 +1231,54 @@ class FormFiller:
             except Exception as e:
                 logger.debug(f"Pre-clean failed: {e}")
 
-            # Enhanced scrolling to ensure cart button is visible
+            # Scroll to the bottom, wait for the cart button to render, hide overlays and
+            # search for cart button candidates in one async call
+            cart_button_candidates = None
             try:
-                logger.info("🔄 Enhanced scrolling to find cart button...")
-                
-                # Get initial page height
-                initial_height = self.driver.execute_script("return document.body.scrollHeight")
-                logger.info(f"Initial page height: {initial_height}px")
-                
-                # Scroll to very bottom (no wait needed, scroll is instant)
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                
-                # Scroll down in multiple steps to load dynamic content
-                for step in range(5):
-                    current_height = self.driver.execute_script("return document.body.scrollHeight")
-                    scroll_position = self.driver.execute_script("return window.pageYOffset")
-                    logger.info(f"Step {step+1}: Page height={current_height}px, Scroll position={scroll_position}px")
-                    
-                    # Scroll down a bit more
-                    self.driver.execute_script(f"window.scrollTo(0, {current_height + 100});")
-                    time.sleep(0.5)
-                    
-                    # Check if new content loaded
-                    new_height = self.driver.execute_script("return document.body.scrollHeight")
-                    if new_height > current_height:
-                        logger.info(f"New content loaded, height increased to {new_height}px")
-                
-                # Final scroll to absolute bottom (no wait, scroll is instant)
-                final_height = self.driver.execute_script("return document.body.scrollHeight")
-                self.driver.execute_script(f"window.scrollTo(0, {final_height});")
-
-                # Also try scrolling the document element (sometimes needed, no wait)
-                self.driver.execute_script("document.documentElement.scrollTop = document.documentElement.scrollHeight;")
-                
-                final_scroll_position = self.driver.execute_script("return window.pageYOffset")
-                logger.info(f"✅ Final scroll position: {final_scroll_position}px of {final_height}px")
-                
-            except Exception as e:
-                logger.warning(f"Enhanced scrolling failed: {e}")
-                # Fallback to simple scroll
-                try:
-                    self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    time.sleep(1)
-                    logger.info("Fallback scroll completed")
-                except WebDriverException as e:
-                    logger.debug(f"Fallback scroll also failed: {e}")
-            
-            # Debug: Find all potential clickable elements including links and divs
-            all_clickables = []
-            
-            # Try different selectors to find all clickable elements
-            selectors_to_try = [
-                "button, input[type='submit'], input[type='button']",
-                "a[href], div[onclick], span[onclick]",
-                "span, div, a",  # Include all spans and divs
-                "*[onclick]",
-                "input[type='image']",
-                ".btn, .button, .cart, .add",
-                ".kounyu_cart_multiline_base",  # Specific cart button class
-                "*[class*='kounyu']",
-                "*[class*='cart']"
-            ]
-            
-            for selector in selectors_to_try:
-                try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    all_clickables.extend(elements)
-                    # Only log if we found significant elements to reduce spam
-                    if len(elements) > 10:
-                        logger.debug(f"Found {len(elements)} elements with selector: {selector}")
-                except Exception as e:
-                    logger.debug(f"Selector {selector} failed: {e}")
-            
-            # Remove duplicates
-            unique_clickables = []
-            seen_elements = set()
-            for element in all_clickables:
-                try:
-                    element_id = id(element)
-                    if element_id not in seen_elements:
-                        unique_clickables.append(element)
-                        seen_elements.add(element_id)
-                except StaleElementReferenceException as e:
-                    logger.debug(f"Stale element during dedup: {e}")
-            
-            logger.info(f"🔍 Found {len(unique_clickables)} clickable elements, filtering for cart buttons...")
-
-            # Extra pre-check: run one more quick popup/overlay dismissal before analyzing buttons
-            try:
-                handled2 = self._dismiss_popups_and_overlays_quick()
-                if handled2:
-                    logger.info(f"Pre-click cleanup dismissed {handled2} popup/overlay elements")
-            except Exception as e:
-                logger.debug(f"Pre-click cleanup failed: {e}")
-            
-            cart_button_candidates = []
-            # Only analyze a reasonable number of elements to reduce log spam
-            elements_to_analyze = min(len(unique_clickables), 100)  # Limit to 100 elements max
+                logger.info("🔄 Scrolling to find cart button...")
+                prepared = self._call_async_helper(
+                    '__prepareCartClick', _CART_RENDERED_SELECTOR, 3000,
+                    _CART_BUTTON_SELECTOR, _CLICKABLE_SELECTORS, 100, _NEGATIVE_CART_TEXTS
+                )
+                scrolled = prepared['scroll']
+                logger.info(f"✅ Final scroll position: {scrolled['position']}px of {scrolled['height']}px")
+                if prepared['hidden']:
+                    logger.info(f"Pre-click cleanup hid {prepared['hidden']} overlay elements")
+                if scrolled['found']:
+                    cart_button_candidates = self._cart_candidates_from_search(prepared['search'])
+                else:
+                    logger.info("Cart button not rendered after scrolling, stepping through the page")
+            except WebDriverException as e:
+                logger.warning(f"Scrolling to cart button failed: {e}")
             
-            # Negative texts we must avoid (view/confirm cart)
-            negative_cart_texts = [
-                '購入カートを確認', 'カートを確認', 'カート確認', '確認', '確認する', 'view', 'チェック', '確認へ'
-            ]
-
-            for i, btn in enumerate(unique_clickables[:elements_to_analyze]):
+            if cart_button_candidates is None:
+                self._scroll_page_in_steps()
+                
+                # Extra pre-check: run one more quick popup/overlay dismissal before analyzing buttons
                 try:
-                    btn_text = btn.get_attribute('value') or btn.text or 'no-text'
-                    btn_onclick = btn.get_attribute('onclick') or 'no-onclick'
-                    btn_class = btn.get_attribute('class') or 'no-class'
-                    btn_id = btn.get_attribute('id') or 'no-id'
-                    btn_name = btn.get_attribute('name') or 'no-name'
-                    
-                    # Check if this looks like a cart button (avoid header cart links)
-                    is_cart_button = (
-                        ('追加' in btn_text or 'カート' in btn_text or 
-                         '購入' in btn_text or '申込' in btn_text or
-                         '購入カートに追加' in btn_text or
-                         'kounyu_cart' in btn_class.lower() or
-                         'cart' in btn_onclick.lower() or 'add' in btn_onclick.lower() or
-                         'buy' in btn_onclick.lower() or 'purchase' in btn_onclick.lower() or
-                         'cart' in btn_class.lower() or 'add' in btn_class.lower() or
-                         'buy' in btn_class.lower() or 'purchase' in btn_class.lower() or
-                         'cart' in btn_id.lower() or 'add' in btn_id.lower() or
-                         'buy' in btn_id.lower() or 'purchase' in btn_id.lower() or
-                         'cart' in btn_name.lower() or 'add' in btn_name.lower() or
-                         'kounyu' in btn_class.lower()) and
-                        # Exclude header navigation cart buttons
-                        not ('header' in btn_class.lower() or 'nav' in btn_class.lower() or
-                             'l-header' in btn_class.lower() or 'main-nav' in btn_class.lower())
-                    )
-                    # Exclude confirm/view-cart variants by text
-                    if is_cart_button and any(neg in btn_text for neg in negative_cart_texts):
-                        is_cart_button = False
-                    
-                    # Only log cart button candidates to reduce log spam
-                    if is_cart_button:
-                        btn_visible = btn.is_displayed()
-                        btn_enabled = btn.is_enabled()
-                        cart_button_candidates.append((i, btn, btn_text))
-                        logger.info(f"  🎯 CART BUTTON {len(cart_button_candidates)}: '{btn_text}' (class: {btn_class}, visible: {btn_visible}, enabled: {btn_enabled})")
-                        
+                    handled2 = self._dismiss_popups_and_overlays_quick()
+                    if handled2:
+                        logger.info(f"Pre-click cleanup dismissed {handled2} popup/overlay elements")
                 except Exception as e:
-                    logger.debug(f"Error analyzing button {i}: {e}")
+                    logger.debug(f"Pre-click cleanup failed: {e}")
+                
+                cart_button_candidates = self._find_cart_button_candidates()
             
             logger.info(f"🎯 Found {len(cart_button_candidates)} cart button candidates")
             
             # Try to find cart button first using improved method
+            start_url = self.driver.current_url
+            start_windows = len(self.driver.window_handles)
             cart_success = self._try_click_cart_button(cart_button_candidates)
             
             if cart_success:
                 logger.info("Cart button clicked successfully")
+                # The form has been submitted; its cached elements are about to go stale
+                self._invalidate_page_caches()
                 
-                # Immediately check for alert before any other checks
+                # Give the click up to a second to raise an alert or navigate, then
+                # check for the alert before any other checks
+                self._wait_for_transition(start_url, timeout=1.0)
                 logger.info("Checking for immediate alert after cart button click...")
                 try:
                     alert = self.driver.switch_to.alert
@@ -636,7 +1286,8 @@ class FormFiller:
                     logger.info(f"✅ Found immediate alert: '{alert_text}'")
                     alert.accept()
                     logger.info("✅ Immediate alert accepted successfully")
-                    time.sleep(2)
+                    # Stop waiting as soon as the page moves on or the cart opens a new window
+                    self._wait_for_transition(start_url, start_windows=start_windows)
 
                     # Check if new window opened
                     self._handle_new_window_after_cart_addition()
@@ -653,8 +1304,8 @@ class FormFiller:
                 except NoAlertPresentException:
                     logger.debug("No immediate alert found")
                     
-                # Wait a moment and check if anything happened
-                time.sleep(2)
+                # Wait for the page to react (navigation or alert) before checking status
+                self._wait_for_transition(start_url)
                 
                 # Check for form validation errors and detailed status (but handle alerts first)
                 try:
@@ -694,15 +1345,16 @@ class FormFiller:
             except Exception as e:
                 logger.debug(f"Pre-submit popup dismissal failed: {e}")
             success = self.driver_manager.click_element_safe(
-                Config.SELECTORS['submit_button'],
+                self._submit_sel,
                 "submit button"
             )
             
             if success:
                 logger.info("Form submitted successfully with regular submit button")
+                self._invalidate_page_caches()
                 # Handle confirmation dialog
                 self._handle_confirmation_dialog()
-                time.sleep(2)
+                self._wait_for_transition(start_url)
                 return True
             else:
                 logger.error("Failed to submit form")
@@ -712,6 +1364,328 @@ class FormFiller:
             logger.error(f"Error submitting form: {e}")
             return False
 
+    def _scroll_page_in_steps(self):
+        """Scroll down in steps to trigger lazily loaded content, then settle at the bottom"""
+        try:
+            # Scroll down in multiple steps to load dynamic content, in one script call
+            scrolled = self.driver.execute_async_script(_SCROLL_IN_STEPS_JS, 5, 500)
+            logger.info(f"Initial page height: {scrolled['initial']}px")
+            for new_height in scrolled['grew']:
+                logger.info(f"New content loaded, height increased to {new_height}px")
+            logger.info(f"✅ Final scroll position: {scrolled['position']}px of {scrolled['height']}px")
+        except Exception as e:
+            logger.warning(f"Enhanced scrolling failed: {e}")
+            # Fallback to simple scroll
+            try:
+                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                time.sleep(1)
+                logger.info("Fallback scroll completed")
+            except WebDriverException as e:
+                logger.debug(f"Fallback scroll also failed: {e}")
+    
+    def _wait_for_transition(self, start_url: str, timeout: float = 2.0,
+                             start_windows: Optional[int] = None) -> bool:
+        """
+        Wait until an alert opens, the page navigates away from start_url, or a window opens
+        
+        Args:
+            start_url: URL before the action that should trigger the transition
+            timeout: Maximum time to wait in seconds
+            start_windows: Window count before the action; None to ignore new windows
+            
+        Returns:
+            bool: True if a transition was seen, False if the timeout expired
+        """
+        def transitioned(driver):
+            # Check for an alert first: reading current_url with an alert open may dismiss it
+            if EC.alert_is_present()(driver):
+                return True
+            if driver.current_url != start_url:
+                return True
+            return start_windows is not None and len(driver.window_handles) > start_windows
+        
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(transitioned)
+            return True
+        except TimeoutException:
+            logger.debug(f"No page transition within {timeout}s")
+            return False
+        except WebDriverException as e:
+            logger.debug(f"Transition wait interrupted: {e}")
+            return True
+    
+    def _find_cart_button_candidates(self, limit: int = 100) -> List[tuple]:
+        """
+        Find add-to-cart button candidates among the page's clickable elements
+        
+        Args:
+            limit: Number of clickable elements to analyze (keeps the log readable)
+            
+        Returns:
+            List[tuple]: (index, element, text) for each candidate, in page analysis order
+        """
+        try:
+            # The site's cart button class usually matches on its own: the helper only
+            # scans every clickable element on the page when it does not
+            return self._cart_candidates_from_search(self._call_helper(
+                '__cartSearch', _CART_BUTTON_SELECTOR, _CLICKABLE_SELECTORS, limit, _NEGATIVE_CART_TEXTS
+            ))
+        except WebDriverException as e:
+            logger.debug(f"In-browser cart button search failed, analyzing elements individually: {e}")
+        
+        cart_button_candidates = []
+        # Find all potential clickable elements including links and divs
+        total_clickables, elements = self._collect_clickables(limit)
+        logger.info(f"🔍 Found {total_clickables} clickable elements, filtering for cart buttons...")
+        
+        for i, (btn, attributes) in enumerate(zip(elements, self._read_clickable_attributes(elements))):
+            try:
+                btn_text, btn_onclick, btn_class, btn_id, btn_name, btn_visible, btn_enabled = attributes
+                btn_text = btn_text or 'no-text'
+                btn_class = btn_class or 'no-class'
+                
+                # Only log cart button candidates to reduce log spam
+                if self._is_cart_button(btn_text, btn_onclick or '', btn_class, btn_id or '', btn_name or ''):
+                    cart_button_candidates.append((i, btn, btn_text))
+                    logger.info(f"  🎯 CART BUTTON {len(cart_button_candidates)}: '{btn_text}' (class: {btn_class}, visible: {btn_visible}, enabled: {btn_enabled})")
+                    
+            except Exception as e:
+                logger.debug(f"Error analyzing button {i}: {e}")
+        
+        return cart_button_candidates
+    
+    def _cart_candidates_from_search(self, found: dict) -> List[tuple]:
+        """
+        Log and unpack the result of the in-browser cart search
+        
+        Args:
+            found: __cartSearch result
+            
+        Returns:
+            List[tuple]: (index, element, text) for each candidate
+        """
+        if found['preferred']:
+            logger.info(f"🔍 Found {found['total']} elements with the cart button class")
+        else:
+            logger.info(f"🔍 Found {found['total']} clickable elements, filtering for cart buttons...")
+        
+        cart_button_candidates = []
+        for i, btn, btn_text, btn_class, btn_visible, btn_enabled in found['candidates']:
+            cart_button_candidates.append((i, btn, btn_text))
+            logger.info(f"  🎯 CART BUTTON {len(cart_button_candidates)}: '{btn_text}' (class: {btn_class}, visible: {btn_visible}, enabled: {btn_enabled})")
+        return cart_button_candidates
+    
+    @staticmethod
+    def _is_cart_button(text: str, onclick: str, css_class: str, element_id: str, name: str) -> bool:
+        """
+        Check whether an element's attributes look like an add-to-cart button
+        
+        Args:
+            text: Value or visible text
+            onclick: onclick attribute
+            css_class: class attribute
+            element_id: id attribute
+            name: name attribute
+            
+        Returns:
+            bool: True for a cart button that is not header navigation or a view/confirm-cart control
+        """
+        onclick, css_class = onclick.lower(), css_class.lower()
+        element_id, name = element_id.lower(), name.lower()
+        # Check if this looks like a cart button (avoid header cart links)
+        is_cart_button = (
+            ('追加' in text or 'カート' in text or
+             '購入' in text or '申込' in text or
+             'kounyu' in css_class or
+             any(word in onclick for word in ('cart', 'add', 'buy', 'purchase')) or
+             any(word in css_class for word in ('cart', 'add', 'buy', 'purchase')) or
+             any(word in element_id for word in ('cart', 'add', 'buy', 'purchase')) or
+             'cart' in name or 'add' in name) and
+            # Exclude header navigation cart buttons ('l-header' and 'main-nav' included)
+            not ('header' in css_class or 'nav' in css_class)
+        )
+        # Exclude confirm/view-cart variants by text
+        return is_cart_button and not any(neg in text for neg in _NEGATIVE_CART_TEXTS)
+    
+    def _find_by_selectors(self, selectors: List[str]) -> List[List[WebElement]]:
+        """
+        Find the matches of several selectors in one script call
+        
+        Args:
+            selectors: CSS or XPath (starting with "/") selectors
+            
+        Returns:
+            List[List[WebElement]]: Each selector's matches, in the order of selectors
+        """
+        try:
+            return self.driver.execute_script(_MATCHES_BY_SELECTOR_JS, selectors)
+        except WebDriverException as e:
+            logger.debug(f"Batched selector lookup failed, querying per selector: {e}")
+        
+        matches = []
+        for selector in selectors:
+            by = By.XPATH if selector.startswith("/") else By.CSS_SELECTOR
+            try:
+                matches.append(self.driver.find_elements(by, selector))
+            except WebDriverException as e:
+                logger.debug(f"Selector {selector} failed: {e}")
+                matches.append([])
+        return matches
+    
+    def _collect_clickables(self, limit: int, selectors: List[str] = _CLICKABLE_SELECTORS) -> Tuple[int, List[WebElement]]:
+        """
+        Collect unique elements matching the selectors in one script call
+        
+        Args:
+            limit: Maximum number of elements to return
+            selectors: CSS or XPath (starting with "/") selectors, in priority order
+            
+        Returns:
+            tuple: (total unique matches, first `limit` elements in selector priority order)
+        """
+        try:
+            found = self.driver.execute_script(_COLLECT_CLICKABLES_JS, selectors, limit)
+            return found['total'], found['elements']
+        except WebDriverException as e:
+            logger.debug(f"Batched element collection failed, querying per selector: {e}")
+        
+        # Remove duplicates (WebElement.id is the driver-side reference, no round-trip)
+        unique_clickables = {}
+        for selector in selectors:
+            try:
+                by = By.XPATH if selector.startswith("/") else By.CSS_SELECTOR
+                for element in self.driver.find_elements(by, selector):
+                    unique_clickables.setdefault(element.id, element)
+            except Exception as e:
+                logger.debug(f"Selector {selector} failed: {e}")
+        return len(unique_clickables), list(unique_clickables.values())[:limit]
+    
+    def _wait_for_navigation(self, previous_url: str, timeout: float = 3.0) -> bool:
+        """
+        Wait for the URL to change from previous_url and the new page to finish loading
+        
+        Args:
+            previous_url: URL before the navigation action
+            timeout: Maximum total time to wait in seconds
+            
+        Returns:
+            bool: True if the URL changed within the timeout, False otherwise
+        """
+        deadline = time.time() + timeout
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(EC.url_changes(previous_url))
+        except TimeoutException:
+            logger.debug(f"URL did not change within {timeout}s")
+            return False
+        
+        try:
+            WebDriverWait(self.driver, max(deadline - time.time(), 0.1), poll_frequency=0.1).until(
+                lambda d: d.execute_script("return document.readyState") == "complete"
+            )
+        except TimeoutException:
+            logger.debug("Page readyState wait timed out after navigation")
+        return True
+    
+    def _scroll_into_view_if_clickable(self, element: WebElement) -> bool:
+        """
+        Scroll an element to the middle of the viewport and check it can take a click, in one script call
+        
+        Args:
+            element: Element about to be clicked
+            
+        Returns:
+            bool: True if the element is enabled, visible and not covered by another element
+        """
+        try:
+            return bool(self.driver.execute_script(_SCROLL_INTO_VIEW_IF_CLICKABLE_JS, element))
+        except WebDriverException as e:
+            logger.debug(f"ScrollIntoView failed: {e}")
+            return False
+    
+    def _page_contains(self, needles: List[str], ignore_case: bool = False) -> Optional[str]:
+        """
+        Search the page markup for the given strings inside the browser
+        
+        Args:
+            needles: Strings to look for, in order
+            ignore_case: Compare against the lowercased markup (needles must be lowercase)
+            
+        Returns:
+            The first needle found in the markup, or None if none is found or the script fails
+        """
+        try:
+            return self.driver.execute_script(_PAGE_CONTAINS_JS, needles, ignore_case)
+        except WebDriverException as e:
+            logger.warning(f"Failed to search page markup: {e}")
+            return None
+    
+    def _read_clickable_attributes(self, elements: List[WebElement]) -> List[list]:
+        """
+        Read text, onclick, class, id, name, visibility and enabled state for each element
+        
+        Args:
+            elements: Elements to read
+            
+        Returns:
+            List[list]: One [text, onclick, class, id, name, visible, enabled] entry per element
+        """
+        if not elements:
+            return []
+        try:
+            return self.driver.execute_script(_CLICKABLE_ATTRIBUTES_JS, elements)
+        except WebDriverException as e:
+            logger.debug(f"Batched attribute read failed, reading per element: {e}")
+        
+        attributes = []
+        for element in elements:
+            try:
+                attributes.append([
+                    element.get_attribute('value') or element.text,
+                    element.get_attribute('onclick'),
+                    element.get_attribute('class'),
+                    element.get_attribute('id'),
+                    element.get_attribute('name'),
+                    element.is_displayed(),
+                    element.is_enabled()
+                ])
+            except WebDriverException as e:
+                logger.debug(f"Error reading element attributes: {e}")
+                attributes.append([None] * 7)
+        return attributes
+
+    def _read_link_attributes(self, elements: List[WebElement]) -> List[list]:
+        """
+        Read text, href, id, name, visibility and enabled state for each link
+        
+        Args:
+            elements: Link elements to read
+            
+        Returns:
+            List[list]: One [text, href, id, name, visible, enabled] entry per element
+        """
+        if not elements:
+            return []
+        try:
+            return self.driver.execute_script(_LINK_ATTRIBUTES_JS, elements)
+        except WebDriverException as e:
+            logger.debug(f"Batched link attribute read failed, reading per element: {e}")
+        
+        attributes = []
+        for element in elements:
+            try:
+                attributes.append([
+                    element.text,
+                    element.get_attribute('href') or '',
+                    element.get_attribute('id') or '',
+                    element.get_attribute('name') or '',
+                    element.is_displayed(),
+                    element.is_enabled()
+                ])
+            except WebDriverException as e:
+                logger.debug(f"Error reading link attributes: {e}")
+                attributes.append(['', '', '', '', False, False])
+        return attributes
+
     def _dismiss_popups_and_overlays_quick(self) -> int:
         """Quickly dismiss common popups and hide overlays that may block clicks.
 
@@ -725,32 +1699,9 @@ class FormFiller:
         except Exception as e:
             logger.debug(f"close_unexpected_popups failed: {e}")
 
-        # Hide overlay/modals with JS (non-destructive styling overrides)
+        # Hide overlay/modals with the installed page helper (non-destructive styling overrides)
         try:
-            js = """
-            (function(){
-                var selectors = [
-                    '.modal-backdrop', '.modal', '.popup', '.overlay',
-                    '[aria-modal="true"]', '[role="dialog"]',
-                    '[class*="modal"]', '[class*="popup"]', '[class*="overlay"]'
-                ];
-                var count = 0;
-                var nodes = document.querySelectorAll(selectors.join(','));
-                for (var i=0;i<nodes.length;i++){
-                    var el = nodes[i];
-                    try{
-                        el.style.setProperty('display','none','important');
-                        el.style.setProperty('visibility','hidden','important');
-                        el.style.setProperty('pointer-events','none','important');
-                        el.style.setProperty('opacity','0','important');
-                        count++;
-                    }catch(e){}
-                }
-                try{ document.body.style.setProperty('overflow','auto','important'); }catch(e){}
-                return count;
-            })();
-            """
-            hidden = self.driver.execute_script(js)
+            hidden = self._call_helper('__hideOverlays')
             if hidden:
                 handled += int(hidden) if isinstance(hidden, (int, float)) else 0
         except WebDriverException as e:
@@ -771,51 +1722,27 @@ class FormFiller:
             # Use adaptive wait for submit operations (reduced timeout for faster processing)
             submit_timeout = self.adaptive_wait.get_submit_timeout(default=3.0, max_timeout=5.0)
 
-            # Method 1: More aggressive JavaScript alert handling with adaptive timeout
-            logger.info("Method 1: Aggressive JavaScript alert handling...")
-            max_attempts = int(submit_timeout / 0.3)  # Check every 0.3 seconds (faster polling)
-            for attempt in range(max_attempts):
-                try:
-                    alert = self.driver.switch_to.alert
-                    alert_text = alert.text
-                    logger.info(f"✅ Found JavaScript alert (attempt {attempt + 1}): '{alert_text}'")
-                    alert.accept()  # Click OK
-                    logger.info("✅ JavaScript alert accepted (OK clicked)")
-
-                    # Wait briefly for any page transition after alert
-                    try:
-                        WebDriverWait(self.driver, 2, poll_frequency=0.1).until(
-                            lambda d: d.execute_script("return document.readyState") == "complete"
-                        )
-                    except TimeoutException:
-                        logger.debug("Page readyState wait timed out after alert accept")
-                    return True
-                except NoAlertPresentException:
-                    if attempt < max_attempts - 1:
-                        logger.debug(f"Attempt {attempt + 1}: No alert yet")
-                        time.sleep(0.3)
-                    continue
-            
-            logger.info("No JavaScript alert found after 10 attempts")
-            
-            # Method 2: Immediate alert check (sometimes alerts appear instantly)
-            logger.info("Method 2: Immediate alert check...")
+            # Method 1: Wait for a JavaScript alert with adaptive timeout
+            logger.info("Method 1: Waiting for JavaScript alert...")
             try:
-                alert = self.driver.switch_to.alert
+                alert = WebDriverWait(self.driver, submit_timeout, poll_frequency=0.1).until(
+                    EC.alert_is_present()
+                )
                 alert_text = alert.text
-                logger.info(f"✅ Found immediate alert: '{alert_text}'")
-                alert.accept()
-                logger.info("✅ Immediate alert accepted")
-                # Wait for page transition
+                logger.info(f"✅ Found JavaScript alert: '{alert_text}'")
+                alert.accept()  # Click OK
+                logger.info("✅ JavaScript alert accepted (OK clicked)")
+
+                # Wait briefly for any page transition after alert
                 try:
                     WebDriverWait(self.driver, 2, poll_frequency=0.1).until(
                         lambda d: d.execute_script("return document.readyState") == "complete"
                     )
                 except TimeoutException:
-                    logger.debug("Page readyState wait timed out after immediate alert")
+                    logger.debug("Page readyState wait timed out after alert accept")
                 return True
-            except NoAlertPresentException:
-                logger.debug("No immediate alert")
+            except (TimeoutException, NoAlertPresentException):
+                logger.info(f"No JavaScript alert found within {submit_timeout:.1f}s")
             
             # Method 3: Enhanced DOM dialog search with immediate action
             logger.info("Method 3: Enhanced DOM dialog search...")
@@ -831,94 +1758,38 @@ class FormFiller:
                 logger.info("✅ Already redirected to confirmation/result page - dialog was likely auto-handled")
                 return True
             
-            # Try to find and click confirmation buttons aggressively
-            confirmation_selectors = [
-                "//button[contains(text(), 'OK')]",
-                "//button[contains(text(), 'はい')]", 
-                "//button[contains(text(), '確認')]",
-                "//button[contains(text(), 'ok')]",
-                "//input[@value='OK']",
-                "//input[@value='はい']", 
-                "//input[@value='確認']",
-                "//button[@value='OK']",
-                "//button[@value='はい']",
-                "//button[@value='確認']",
-                "button[onclick*='ok']",
-                "button[onclick*='OK']",
-                "button[onclick*='confirm']",
-                ".modal button",
-                ".dialog button", 
-                ".popup button",
-                "[role='dialog'] button",
-                ".confirm-button",
-                ".ok-button",
-                "*[data-action='confirm']",
-                "*[data-action='ok']"
-            ]
-            
-            # Avoid delete/cancel buttons
-            avoid_keywords = ['削除', 'delete', '取消', 'cancel', '×', 'close', '閉じる', 'キャンセル']
-            
-            # Try each selector with multiple attempts
-            for selector in confirmation_selectors:
-                for attempt in range(3):  # 3 attempts per selector
-                    try:
-                        if selector.startswith("//"):
-                            elements = self.driver.find_elements(By.XPATH, selector)
-                        else:
-                            elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                        
-                        for element in elements:
-                            if element.is_displayed() and element.is_enabled():
-                                element_text = element.text or element.get_attribute('value') or 'no-text'
-                                
-                                # Skip delete/cancel buttons
-                                if any(keyword in element_text.lower() for keyword in avoid_keywords):
-                                    logger.debug(f"Skipping avoid button: '{element_text}'")
-                                    continue
-                                
-                                # Click any visible confirmation-like button
-                                logger.info(f"Found potential OK button: '{element_text}' (selector: {selector})")
-                                try:
-                                    element.click()
-                                    logger.info(f"✅ Clicked confirmation button: '{element_text}'")
-
-                                    # Wait for URL change first (page transition)
-                                    try:
-                                        WebDriverWait(self.driver, 3, poll_frequency=0.1).until(
-                                            lambda d: d.current_url != current_url
-                                        )
-                                    except TimeoutException:
-                                        logger.debug("URL did not change within timeout after confirm click")
-                                    # Then wait for page to fully load
-                                    try:
-                                        WebDriverWait(self.driver, 2, poll_frequency=0.1).until(
-                                            lambda d: d.execute_script("return document.readyState") == "complete"
-                                        )
-                                    except TimeoutException:
-                                        logger.debug("Page readyState wait timed out after confirm click")
-
-                                    # Check if URL changed (redirect to result page)
-                                    new_url = self.driver.current_url
-                                    if new_url != current_url:
-                                        logger.info(f"✅ URL changed after button click: {new_url}")
-                                        return True
+            # Find every clickable confirmation-like button in selector priority order in one script call
+            for element, element_text in self._find_confirmation_buttons():
+                # Click any visible confirmation-like button
+                logger.info(f"Found potential OK button: '{element_text}'")
+                try:
+                    element.click()
+                    logger.info(f"✅ Clicked confirmation button: '{element_text}'")
 
-                                    return True
-                                except Exception as click_error:
-                                    logger.debug(f"Failed to click button '{element_text}': {click_error}")
-                                    continue
-                                    
-                    except Exception as e:
-                        logger.debug(f"Selector {selector} attempt {attempt + 1} failed: {e}")
-                        if attempt < 2:  # Wait before retry
-                            time.sleep(0.2)  # Reduced from 0.5s for faster retry
-                        continue
+                    # Wait for the redirect to the result page and for it to load
+                    if self._wait_for_navigation(current_url, timeout=3.0):
+                        logger.info(f"✅ URL changed after button click: {self.driver.current_url}")
+
+                    return True
+                except Exception as click_error:
+                    logger.debug(f"Failed to click button '{element_text}': {click_error}")
+                    continue
+            
+            # Method 4: Answer a late JavaScript dialog over DevTools, the native path for alert/confirm
+            if self._cdp_dialogs:
+                logger.info("Method 4: Accepting JavaScript dialog via DevTools...")
+                try:
+                    self.driver.execute_cdp_cmd('Page.handleJavaScriptDialog', {'accept': True})
+                    logger.info("✅ JavaScript dialog accepted via DevTools")
+                    self._wait_for_navigation(current_url, timeout=2.0)
+                    return True
+                except WebDriverException as e:
+                    # Raised when no dialog is showing
+                    logger.debug(f"No dialog for DevTools to handle: {e}")
             
-            # Method 4: Try pressing Enter key (sometimes works for dialogs)
-            logger.info("Method 4: Trying Enter key...")
+            # Method 5: Try pressing Enter key (sometimes works for dialogs)
+            logger.info("Method 5: Trying Enter key...")
             try:
-                from selenium.webdriver.common.keys import Keys
                 # Try Enter on body
                 self.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ENTER)
                 logger.info("✅ Pressed Enter key on body")
@@ -966,6 +1837,39 @@ class FormFiller:
             logger.error(f"❌ Error handling confirmation dialog: {e}")
             return False
     
+    def _find_confirmation_buttons(self, limit: int = 50) -> List[Tuple[WebElement, str]]:
+        """
+        Find visible, enabled confirmation buttons that are not delete/cancel/close controls
+        
+        Args:
+            limit: Maximum number of matching elements to examine
+            
+        Returns:
+            List[tuple]: (element, text) for each acceptable button, in selector priority order
+        """
+        try:
+            return [tuple(button) for button in self._call_helper(
+                '__confirmationButtons', _CONFIRMATION_SELECTORS, limit, list(_AVOID_KEYWORDS)
+            )]
+        except WebDriverException as e:
+            logger.debug(f"In-browser confirmation button search failed, checking elements individually: {e}")
+        
+        buttons = []
+        _, elements = self._collect_clickables(limit, selectors=_CONFIRMATION_SELECTORS)
+        for element, attributes in zip(elements, self._read_clickable_attributes(elements)):
+            text, _, _, _, _, visible, enabled = attributes
+            if not (visible and enabled):
+                continue
+            element_text = text or 'no-text'
+            
+            # Skip delete/cancel buttons
+            lowered_text = element_text.lower()
+            if any(keyword in lowered_text for keyword in _AVOID_KEYWORDS):
+                logger.debug(f"Skipping avoid button: '{element_text}'")
+                continue
+            buttons.append((element, element_text))
+        return buttons
+    
     def _handle_new_window_after_cart_addition(self):
         """
         Handle new window that might open after cart addition.
@@ -996,7 +1900,11 @@ class FormFiller:
 
                     try:
                         self.driver.switch_to.window(handle)
-                        time.sleep(1)
+                        # A freshly opened popup reports about:blank until its page starts loading
+                        try:
+                            self._fast_wait.until(lambda d: d.current_url != 'about:blank')
+                        except TimeoutException:
+                            logger.debug(f"  Extra window {handle} is still blank")
                         win_url = self.driver.current_url
                         logger.info(f"  Extra window URL: {win_url}")
 
@@ -1025,22 +1933,31 @@ class FormFiller:
             except WebDriverException as e:
                 logger.debug(f"Failed to switch back to original window: {e}")
     
-    def _check_browser_alive(self) -> bool:
+    def _check_browser_alive(self, use_cache: bool = True) -> bool:
         """
         Check if browser is still alive and responsive
         
+        Args:
+            use_cache: Reuse a result probed within the last _ALIVE_CACHE_TTL seconds
+            
         Returns:
             bool: True if browser is responsive, False otherwise
         """
+        checked_at, alive = self._alive_cache
+        if use_cache and time.monotonic() - checked_at < _ALIVE_CACHE_TTL:
+            return alive
+        
         try:
-            # Try to get current URL - this will fail if browser crashed
-            _ = self.driver.current_url
-            # Try to execute a simple JavaScript command
+            # A simple JavaScript command fails if the browser crashed or the page is hung,
+            # so a separate current_url read adds nothing
             self.driver.execute_script("return document.readyState;")
-            return True
+            alive = True
         except Exception as e:
             logger.warning(f"Browser responsiveness check failed: {e}")
-            return False
+            alive = False
+        
+        self._alive_cache = (time.monotonic(), alive)
+        return alive
     
     def _handle_cart_page_navigation(self) -> bool:
         """
@@ -1049,28 +1966,22 @@ class FormFiller:
         Returns:
             bool: True if navigation handled successfully, False otherwise
         """
-        import time
         start_time = time.time()
         max_navigation_time = 30  # 30 seconds max for navigation
         
         try:
-            # Add browser stability check
-            if not self._check_browser_alive():
-                logger.error("Browser is not responsive - cannot handle cart page navigation")
+            # Add browser stability check; the URL read fails if the browser crashed.
+            # Re-read it only after actions that can change it (click, back, get).
+            try:
+                current_url = page_url = self.driver.current_url
+            except WebDriverException as e:
+                logger.error(f"Browser is not responsive - cannot handle cart page navigation: {e}")
                 return False
-                
-            current_url = self.driver.current_url
             logger.info(f"Current URL after cart addition: {current_url}")
             
-            # Check if we're on cart page or confirmation page
-            try:
-                page_source = self.driver.page_source
-            except Exception as e:
-                logger.warning(f"Failed to get page source: {e}")
-                page_source = ""
-                
-            if ("cart" in current_url.lower() or "カート" in page_source or "SPSL006" in page_source or 
-                "confirm" in current_url.lower() or "index.html" in current_url):
+            # Check if we're on cart page or confirmation page (the page markup is only
+            # searched, in the browser, when the URL alone does not tell)
+            if _CART_URL_RE.search(current_url) or self._page_contains(["カート", "SPSL006"]):
                 logger.info("✅ Detected cart page - product added successfully")
                 
                 # Try multiple methods to return to voting page with timeout
@@ -1078,26 +1989,10 @@ class FormFiller:
                 
                 # Method 1: Look for specific links to voting page (including the new button)
                 try:
-                    # Set shorter timeout for link searches to avoid hanging
-                    from selenium.webdriver.support.wait import WebDriverWait
-                    from selenium.webdriver.support import expected_conditions as EC
-                    
-                    # Prioritize specific "totoの投票を追加する" buttons first to avoid wrong redirects
-                    voting_page_links = [
-                        "//*[contains(@class, 'c-clubtoto-btn-base__text') and contains(text(), 'totoの投票を追加する')]",
-                        "//button[contains(text(), 'totoの投票を追加する')]",
-                        "//a[contains(text(), 'totoの投票を追加する')]",
-                        "//p[contains(text(), 'totoの投票を追加する')]",
-                        "//img[@id='select_single' or @name='select_single']",  # Single button for next batch
-                        "//a[contains(@href, 'PGSPSL00001MoveSingleVoteSheet')]",
-                        "//a[contains(text(), '続けて購入')]",
-                        "//a[contains(text(), '投票を追加')]",
-                        "//a[contains(text(), '投票')]",
-                        "//a[contains(text(), '予想')]",
-                        # Removed generic "toto" and breadcrumb links to avoid wrong redirects
-                    ]
-                    
-                    for link_xpath in voting_page_links:
+                    # Every link XPath is evaluated in one call, and again only after a click
+                    # has moved the browser to another page
+                    link_matches = None
+                    for position, link_xpath in enumerate(_VOTING_PAGE_RETURN_LINKS):
                         try:
                             # Check timeout
                             if time.time() - start_time > max_navigation_time:
@@ -1109,20 +2004,18 @@ class FormFiller:
                                 logger.warning("Browser became unresponsive, skipping navigation")
                                 return False
                             
-                            # Use timeout for element search
-                            wait = WebDriverWait(self.driver, 3)  # 3 second timeout per element
-                            if link_xpath.startswith("//"):
-                                elements = self.driver.find_elements(By.XPATH, link_xpath)
-                            else:
-                                elements = self.driver.find_elements(By.CSS_SELECTOR, link_xpath)
+                            if link_matches is None:
+                                link_matches = self._find_by_selectors(_VOTING_PAGE_RETURN_LINKS)
+                            elements = link_matches[position]
                                 
-                            for element in elements:
-                                if element.is_displayed() and element.is_enabled():
-                                    link_text = element.text or element.get_attribute('href') or 'no-text'
-                                    link_href = element.get_attribute('href') or ''
+                            link_attributes = self._read_link_attributes(elements)
+                            for element, (text, link_href, element_id, name, visible, enabled) in zip(elements, link_attributes):
+                                if visible and enabled:
+                                    link_text = text or link_href or 'no-text'
                                     
                                     # Skip links that lead to confirmation/result pages
-                                    if any(bad_url in link_href.lower() for bad_url in ['confirm', 'result', 'vote/confirm']):
+                                    href_lc = link_href.lower()
+                                    if any(bad_url in href_lc for bad_url in _BAD_RETURN_URLS):
                                         logger.debug(f"Skipping link that leads to confirmation page: {link_href}")
                                         continue
                                     
@@ -1131,15 +2024,16 @@ class FormFiller:
                                     # Special handling for specific buttons
                                     if 'totoの投票を追加する' in link_text:
                                         logger.info("🎯 Found 'totoの投票を追加する' button - clicking to return to voting page")
-                                    elif 'select_single' in str(element.get_attribute('id')) or 'select_single' in str(element.get_attribute('name')):
+                                    elif 'select_single' in element_id or 'select_single' in name:
                                         logger.info("🎯 Found 'シングル' button - clicking to start next batch input loop")
                                     
                                     element.click()
-                                    time.sleep(3)  # Wait longer for page transition
+                                    self._wait_for_navigation(page_url)
+                                    link_matches = None
                                     
                                     # Check if we're back on voting page
-                                    new_url = self.driver.current_url
-                                    if "PGSPSL00001MoveSingleVoteSheet.form" in new_url:
+                                    new_url = page_url = self.driver.current_url
+                                    if _VOTING_URL_RE.search(new_url):
                                         logger.info("✅ Successfully returned to voting page via link")
                                         return True
                                     elif "vote/confirm" in new_url:
@@ -1160,11 +2054,11 @@ class FormFiller:
                 logger.info("🔄 Trying browser back navigation...")
                 try:
                     self.driver.back()
-                    time.sleep(3)
+                    self._wait_for_navigation(page_url)
                     
                     # Verify we're back on voting page
-                    new_url = self.driver.current_url
-                    if "PGSPSL00001MoveSingleVoteSheet.form" in new_url:
+                    new_url = page_url = self.driver.current_url
+                    if _VOTING_URL_RE.search(new_url):
                         logger.info("✅ Successfully returned to voting page via back button")
                         return True
                     else:
@@ -1181,10 +2075,10 @@ class FormFiller:
                         voting_url = "https://store.toto-dream.com/dcs/subos/screen/ps01/spsl000/PGSPSL00001MoveSingleVoteSheet.form"
                         logger.info(f"Attempting direct navigation to: {voting_url}")
                         self.driver.get(voting_url)
-                        time.sleep(3)
+                        self._wait_for_navigation(page_url)
                         
                         new_url = self.driver.current_url
-                        if "PGSPSL00001MoveSingleVoteSheet.form" in new_url:
+                        if _VOTING_URL_RE.search(new_url):
                             logger.info("✅ Successfully returned to voting page via direct URL")
                             return True
                         else:
@@ -1197,7 +2091,7 @@ class FormFiller:
                 return self._navigate_to_voting_page()
             
             # If not on cart page, we might still be on voting page
-            elif "PGSPSL00001MoveSingleVoteSheet.form" in current_url:
+            elif _VOTING_URL_RE.search(current_url):
                 logger.info("✅ Still on voting page - ready for next batch")
                 return True
             
@@ -1208,8 +2102,8 @@ class FormFiller:
         except Exception as e:
             logger.error(f"❌ Error handling cart page navigation: {e}")
             
-            # Check if browser crashed
-            if not self._check_browser_alive():
+            # Check if browser crashed; the error may be newer than any cached probe
+            if not self._check_browser_alive(use_cache=False):
                 logger.error("Browser appears to have crashed during navigation")
                 return False
             
@@ -1218,10 +2112,10 @@ class FormFiller:
                 logger.info("Attempting emergency navigation to voting page...")
                 voting_url = "https://www.toto-dream.com/toto/index.html"
                 self.driver.get(voting_url)
-                time.sleep(3)
+                self.driver_manager.wait_for_page_load(timeout=3)
                 
                 current_url = self.driver.current_url
-                if "PGSPSL00001MoveSingleVoteSheet.form" in current_url or "toto" in current_url:
+                if _VOTING_URL_RE.search(current_url) or "toto" in current_url:
                     logger.info("✅ Emergency navigation successful")
                     return True
                 else:
@@ -1242,23 +2136,15 @@ class FormFiller:
             logger.info("🔄 Attempting to navigate to voting page...")
             
             # Try to find link to voting page
-            voting_links = [
-                "//a[contains(@href, 'PGSPSL00001MoveSingleVoteSheet')]",
-                "//a[contains(text(), '投票')]",
-                "//a[contains(text(), '予想')]",
-                "//button[contains(text(), '投票')]",
-                "//button[contains(text(), '予想')]"
-            ]
-            
-            for link_xpath in voting_links:
+            for link_xpath, elements in zip(_VOTING_PAGE_LINKS, self._find_by_selectors(_VOTING_PAGE_LINKS)):
                 try:
-                    elements = self.driver.find_elements(By.XPATH, link_xpath)
                     if elements:
                         element = elements[0]
                         if element.is_displayed() and element.is_enabled():
+                            previous_url = self.driver.current_url
                             element.click()
                             logger.info(f"✅ Clicked voting page link: {link_xpath}")
-                            time.sleep(2)
+                            self._wait_for_navigation(previous_url, timeout=2.0)
                             return True
                 except Exception as e:
                     logger.debug(f"Failed to click link {link_xpath}: {e}")
@@ -1288,56 +2174,51 @@ class FormFiller:
             except Exception as e:
                 logger.debug(f"Quick cleanup before cart click failed: {e}")
 
+            # Read class, onclick, visibility and enabled state for every candidate in one call
+            buttons = [btn for _, btn, _ in cart_button_candidates]
+            probed = [
+                (btn, text, attributes)
+                for (_, btn, text), attributes in zip(cart_button_candidates, self._read_clickable_attributes(buttons))
+            ]
+
             # Sort candidates to prioritize true '追加' buttons and known classes, de-prioritize anything with '確認'
-            def score_candidate(btn, text: str) -> int:
+            def score_candidate(text: str, attributes: list) -> int:
                 t = text or ''
-                cls = (btn.get_attribute('class') or '').lower()
-                onclick = (btn.get_attribute('onclick') or '').lower()
-                score = 0
-                if '購入カートに追加' in t:
-                    score += 100
-                if 'カートに追加' in t:
-                    score += 80
-                if '追加' in t:
-                    score += 60
-                if 'kounyu_cart' in cls or 'kounyu_cart_multiline_base' in cls:
+                score = max((_CART_TEXT_WEIGHTS[m] for m in _CART_TEXT_RE.findall(t)), default=0)
+                if _CART_CLASS_RE.search((attributes[2] or '').lower()):
                     score += 50
-                if 'cart' in onclick or 'add' in onclick:
+                if _CART_ONCLICK_RE.search((attributes[1] or '').lower()):
                     score += 20
                 # Strongly penalize confirm/view variants
-                for neg in ['購入カートを確認','カートを確認','カート確認','確認','確認する','view','チェック','確認へ']:
-                    if neg in t:
-                        score -= 1000
+                if _NEGATIVE_CART_RE.search(t):
+                    score -= 1000
                 return score
 
-            sorted_candidates = sorted(cart_button_candidates, key=lambda tup: score_candidate(tup[1], tup[2]), reverse=True)
+            sorted_candidates = sorted(probed, key=lambda tup: score_candidate(tup[1], tup[2]), reverse=True)
 
             # Method 1: Try direct candidates from analysis (sorted by priority)
             logger.info("🎯 Method 1: Trying direct cart button candidates...")
-            for i, (index, btn, text) in enumerate(sorted_candidates):
+            for i, (btn, text, attributes) in enumerate(sorted_candidates):
                 try:
-                    if btn.is_displayed() and btn.is_enabled():
+                    visible, enabled = attributes[5], attributes[6]
+                    if visible and enabled:
                         logger.info(f"Attempting to click candidate {i}: '{text}'")
-                        # Ensure in view and unobscured
-                        try:
-                            self.driver.execute_script("arguments[0].scrollIntoView({behavior:'instant',block:'center'});", btn)
-                        except WebDriverException as e:
-                            logger.debug(f"ScrollIntoView failed for candidate {i}: {e}")
                         # One more cleanup right before click
                         try:
                             self._dismiss_popups_and_overlays_quick()
                         except Exception as e:
                             logger.debug(f"Pre-click cleanup failed for candidate {i}: {e}")
                         try:
-                            # Prefer waiting for clickable to avoid intercepted clicks
-                            if self.wait:
-                                self.wait.until(EC.element_to_be_clickable(btn))
+                            # Ensure in view and unobscured; only wait for clickable (to avoid
+                            # intercepted clicks) when the in-page check cannot confirm it, and
+                            # then on the short, tightly polled wait rather than the page wait
+                            if not self._scroll_into_view_if_clickable(btn):
+                                self._fast_wait.until(EC.element_to_be_clickable(btn))
                             btn.click()
                         except (ElementClickInterceptedException, ElementNotInteractableException) as ce:
                             logger.debug(f"Direct click intercepted for candidate {i}: {ce} — trying JS click")
                             self.driver.execute_script("arguments[0].click();", btn)
                         logger.info(f"✅ Successfully clicked cart button candidate {i}: '{text}'")
-                        time.sleep(1)
                         return True
                 except Exception as e:
                     logger.warning(f"Failed to click candidate {i}: {e}")
@@ -1346,7 +2227,7 @@ class FormFiller:
             # Method 2: Try using WebDriverManager's click_element_safe
             logger.info("🎯 Method 2: Trying with WebDriverManager...")
             cart_success = self.driver_manager.click_element_safe(
-                Config.SELECTORS['cart_button'], 
+                self._cart_sel, 
                 "cart button"
             )
             if cart_success:
@@ -1355,50 +2236,25 @@ class FormFiller:
             
             # Method 3: Try XPath-based search for cart buttons
             logger.info("🎯 Method 3: Trying XPath-based search...")
-            cart_xpaths = [
-                "//span[contains(@class, 'kounyu_cart_multiline_base')]",
-                "//span[contains(text(), '購入カートに追加')]",
-                "//*[contains(@class, 'kounyu_cart')]",
-                "//div[contains(text(), '購入カートに追加')]",
-                "//a[contains(text(), '購入カートに追加')]",
-                "//input[contains(@value, 'カートに追加')]",
-                "//input[contains(@value, '購入カートに追加')]",
-                "//input[contains(@value, '追加')]",
-                "//button[contains(text(), 'カートに追加')]",
-                "//button[contains(text(), '購入カートに追加')]",
-                "//button[contains(text(), '追加')]",
-                "//span[contains(text(), 'カート')]",
-                "//span[contains(text(), '追加')]",
-                "//input[@type='submit' and contains(@value, 'カート')]",
-                "//input[@type='button' and contains(@value, 'カート')]",
-                "//button[@type='submit' and contains(text(), 'カート')]",
-                "//button[@type='button' and contains(text(), 'カート')]",
-                "//*[contains(@onclick, 'cart') or contains(@onclick, 'Cart')]",
-                "//*[contains(@onclick, 'add') or contains(@onclick, 'Add')]"
-            ]
-            
-            for xpath in cart_xpaths:
+            for xpath in _CART_XPATHS:
                 try:
                     try:
                         self._dismiss_popups_and_overlays_quick()
                     except Exception as e:
                         logger.debug(f"Popup dismissal before XPath cart search failed: {e}")
                     elements = self.driver.find_elements(By.XPATH, xpath)
-                    for element in elements:
-                        if element.is_displayed() and element.is_enabled():
-                            element_text = element.get_attribute('value') or element.text or 'no-text'
+                    for element, attributes in zip(elements, self._read_clickable_attributes(elements)):
+                        element_text, _, _, _, _, visible, enabled = attributes
+                        if visible and enabled:
+                            element_text = element_text or 'no-text'
                             # Skip confirm/view-cart variants
-                            if any(neg in element_text for neg in ['購入カートを確認','カートを確認','カート確認','確認','確認する','view','チェック','確認へ']):
+                            if any(neg in element_text for neg in _NEGATIVE_CART_TEXTS):
                                 logger.debug(f"Skipping non-add cart button: '{element_text}'")
                                 continue
                             logger.info(f"Trying XPath cart button: '{element_text}'")
-                            try:
-                                self.driver.execute_script("arguments[0].scrollIntoView({behavior:'instant',block:'center'});", element)
-                            except WebDriverException as e:
-                                logger.debug(f"ScrollIntoView failed for XPath element: {e}")
+                            self._scroll_into_view_if_clickable(element)
                             element.click()
                             logger.info(f"✅ Successfully clicked XPath cart button: '{element_text}'")
-                            time.sleep(1)
                             return True
                 except Exception as e:
                     logger.debug(f"XPath {xpath} failed: {e}")
@@ -1407,62 +2263,10 @@ class FormFiller:
             # Method 4: JavaScript click for stubborn buttons
             logger.info("🎯 Method 4: Trying JavaScript click...")
             try:
-                # Try to find any element with cart-related attributes via JavaScript
-                js_script = """
-                var elements = document.querySelectorAll('*');
-                for (var i = 0; i < elements.length; i++) {
-                    var elem = elements[i];
-                    var text = elem.value || elem.textContent || elem.innerText || '';
-                    var onclick = elem.getAttribute('onclick') || '';
-                    var className = elem.className || '';
-                    var id = elem.id || '';
-                    
-                    if (text.includes('購入カートに追加') || 
-                        className.includes('kounyu_cart_multiline_base') ||
-                        className.includes('kounyu_cart') ||
-                        text.includes('追加') || text.includes('カート') || 
-                        onclick.toLowerCase().includes('cart') || onclick.toLowerCase().includes('add') ||
-                        className.toLowerCase().includes('cart') || className.toLowerCase().includes('add') ||
-                        id.toLowerCase().includes('cart') || id.toLowerCase().includes('add')) {
-                        
-                        console.log('Found cart element via JS:', text, 'class:', className);
-                        try {
-                            // Try multiple click methods
-                            console.log('Attempting to click element:', text);
-                            
-                            // Method 1: Direct click
-                            elem.click();
-                            
-                            // Method 2: Dispatch click event
-                            var clickEvent = new MouseEvent('click', {
-                                view: window,
-                                bubbles: true,
-                                cancelable: true
-                            });
-                            elem.dispatchEvent(clickEvent);
-                            
-                            // Method 3: If it has onclick, execute it
-                            if (onclick) {
-                                try {
-                                    eval(onclick);
-                                } catch (e2) {
-                                    console.log('onclick eval failed:', e2);
-                                }
-                            }
-                            
-                            return 'clicked: ' + text + ' (class: ' + className + ')';
-                        } catch (e) {
-                            console.log('Click failed for element:', e);
-                        }
-                    }
-                }
-                return 'not found';
-                """
-                
-                result = self.driver.execute_script(js_script)
+                # Only elements the targeted selector matches are tested, not every node on the page
+                result = self.driver.execute_script(_JS_CART_CLICK_JS, _JS_CART_CLICK_SELECTOR, _NEGATIVE_CART_TEXTS)
                 if result and result != 'not found':
                     logger.info(f"✅ JavaScript click successful: {result}")
-                    time.sleep(1)
                     return True
                 else:
                     logger.info("JavaScript method found no clickable cart buttons")
@@ -1574,11 +2378,10 @@ class FormFiller:
                     "カート", "cart", "追加", "success", "complete"
                 ]
                 
-                page_source_lower = self.driver.page_source.lower()
-                for indicator in success_indicators:
-                    if indicator in page_source_lower:
-                        logger.info(f"Found success indicator: '{indicator}' in page")
-                        return True
+                indicator = self._page_contains(success_indicators, ignore_case=True)
+                if indicator:
+                    logger.info(f"Found success indicator: '{indicator}' in page")
+                    return True
                         
             except Exception as e:
                 logger.debug(f"Page content check failed: {e}")
@@ -1724,6 +2527,9 @@ class FormFiller:
         try:
             logger.info("Navigating to next form or voting page for next batch")
             
+            # Cached checkbox elements belong to the page we are leaving
+            self._invalidate_page_caches()
+            
             # First try the cart page navigation (for post-cart scenarios)
             if self._handle_cart_page_navigation():
                 logger.info("Successfully navigated back to voting page via cart navigation")
@@ -1731,7 +2537,7 @@ class FormFiller:
             
             # If that fails, try the traditional next button approach
             success = self.driver_manager.click_element_safe(
-                Config.SELECTORS['next_button'], 
+                self._next_sel, 
                 "next button"
             )
             
@@ -1746,10 +2552,10 @@ class FormFiller:
                 try:
                     voting_url = "https://www.toto-dream.com/toto/index.html"
                     self.driver.get(voting_url)
-                    time.sleep(3)
+                    self.driver_manager.wait_for_page_load(timeout=3)
                     
                     current_url = self.driver.current_url
-                    if "PGSPSL00001MoveSingleVoteSheet.form" in current_url or "toto" in current_url:
+                    if _VOTING_URL_RE.search(current_url) or "toto" in current_url:
                         logger.info("✅ Emergency navigation to voting page successful")
                         return True
                     else:
@@ -1774,7 +2580,7 @@ class FormFiller:
             logger.info("Looking for confirmation checkbox")
             
             success = self.driver_manager.click_element_safe(
-                Config.SELECTORS['confirm_checkbox'], 
+                self._confirm_sel, 
                 "confirmation checkbox"
             )
             
@@ -1797,25 +2603,26 @@ class FormFiller:
             dict: Form status information
         """
         try:
-            status = {
-                "page_title": self.driver.title,
-                "current_url": self.driver.current_url,
-                "page_loaded": self.driver.execute_script("return document.readyState") == "complete"
+            page = self._call_helper('__statusSnapshot')
+            return {
+                "page_title": page['title'],
+                "current_url": page['url'],
+                "page_loaded": page['ready'] == "complete",
+                "total_checkboxes": page['total'],
+                "selected_checkboxes": page['checked']
             }
             
-            # Count checkboxes on current page
-            checkboxes = self.driver.find_elements(By.CSS_SELECTOR, "input[type='checkbox']")
-            status["total_checkboxes"] = len(checkboxes)
-            status["selected_checkboxes"] = len([cb for cb in checkboxes if cb.is_selected()])
-            
-            return status
-            
         except Exception as e:
             logger.error(f"Error getting form status: {e}")
             return {"error": str(e)}
     
     def _debug_page_elements(self, game_index: int, set_index: int, vote_value: int):
         """Debug function to inspect page elements when checkbox is not found"""
+        # One dump per batch is enough to diagnose a missing checkbox
+        if self._debug_dumps >= 1 or not logger.isEnabledFor(logging.INFO):
+            return
+        self._debug_dumps += 1
+        
         try:
             # Take screenshot
             timestamp = int(time.time())
@@ -1824,17 +2631,17 @@ class FormFiller:
             logger.info(f"Debug screenshot saved: {screenshot_file}")
             
             # Log page information
-            logger.info(f"Current URL: {self.driver.current_url}")
-            logger.info(f"Page title: {self.driver.title}")
+            page = self._call_helper('__statusSnapshot')
+            logger.info(f"Current URL: {page['url']}")
+            logger.info(f"Page title: {page['title']}")
             
-            # Find all checkboxes on the page
-            all_checkboxes = self.driver.find_elements(By.CSS_SELECTOR, "input[type='checkbox']")
-            logger.info(f"Total checkboxes found on page: {len(all_checkboxes)}")
+            # Read all checkbox names in one round-trip and inspect them locally
+            checkbox_names = [name or 'no-name' for name in self._call_helper('__checkboxNames')]
+            logger.info(f"Total checkboxes found on page: {len(checkbox_names)}")
             
             # Find all unique game indices from checkbox names
             game_indices = set()
-            for cb in all_checkboxes:
-                name = cb.get_attribute('name') or 'no-name'
+            for name in checkbox_names:
                 if name.startswith('chkbox_'):
                     try:
                         parts = name.split('_')
@@ -1849,15 +2656,16 @@ class FormFiller:
             logger.info(f"Total games available: {len(sorted_games)}")
             
             # Check 390 checkboxes structure
-            total_checkboxes = len(all_checkboxes)
+            total_checkboxes = len(checkbox_names)
             if total_checkboxes == 390:
                 games_calculated = total_checkboxes // (3 * 10)  # 3 choices * 10 sets
                 logger.info(f"Calculated games from 390 checkboxes: {games_calculated}")
             
             # Show sample checkboxes for each game found
             for game_idx in sorted_games[:5]:  # First 5 games
-                sample_cb = self.driver.find_elements(By.CSS_SELECTOR, f"input[name^='chkbox_{game_idx}_']")
-                logger.info(f"Game {game_idx}: found {len(sample_cb)} checkboxes")
+                prefix = f"chkbox_{game_idx}_"
+                sample_count = sum(1 for name in checkbox_names if name.startswith(prefix))
+                logger.info(f"Game {game_idx}: found {sample_count} checkboxes")
             
             # Try to find checkboxes with similar patterns
             similar_patterns = [
@@ -1869,17 +2677,16 @@ class FormFiller:
             
             # Search for any checkbox containing the game index
             logger.info(f"Searching for any checkbox containing game index {game_index}...")
-            all_checkboxes_with_game = self.driver.find_elements(By.CSS_SELECTOR, f"input[type='checkbox'][name*='chkbox_{game_index}_']")
+            all_checkboxes_with_game = [name for name in checkbox_names if f"chkbox_{game_index}_" in name]
             logger.info(f"Found {len(all_checkboxes_with_game)} checkboxes with game index {game_index}")
             
-            for i, cb in enumerate(all_checkboxes_with_game[:5]):
-                name = cb.get_attribute('name') or 'no-name'
+            for i, name in enumerate(all_checkboxes_with_game[:5]):
                 logger.info(f"  Game {game_index} checkbox {i}: name='{name}'")
             
             for pattern in similar_patterns:
-                elements = self.driver.find_elements(By.NAME, pattern)
-                if elements:
-                    logger.info(f"Found elements with pattern '{pattern}': {len(elements)}")
+                matches = checkbox_names.count(pattern)
+                if matches:
+                    logger.info(f"Found elements with pattern '{pattern}': {matches}")
                     
         except Exception as debug_e:
             logger.error(f"Error in debug function: {debug_e}")
\ No newline at end of file
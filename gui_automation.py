@@ -417,9 +417,11 @@ class AutomationGUI:
         )
         if filename:
             try:
-                with open(filename, 'w', encoding='utf-8') as f:
-                    logs = self.log_display.get(1.0, tk.END)
-                    f.write(logs)
+                logs = self.log_display.get(1.0, tk.END)
+                # Translate line endings and encode in one pass, then write in binary
+                data = logs.replace('\n', os.linesep).encode('utf-8', errors='replace')
+                with open(filename, 'wb', buffering=1 << 20) as f:
+                    f.write(data)
                 messagebox.showinfo("Success", f"Logs saved to {filename}")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to save logs: {e}")
@@ -6,12 +6,11 @@ Simple launcher script for the GUI application
 import sys
 import tkinter as tk
 from tkinter import messagebox
-import subprocess
-import pkg_resources
-import importlib.util
 
 def check_dependencies():
     """Check if all required dependencies are installed"""
+    from importlib import metadata
+    
     required_packages = [
         'selenium',
         'pandas', 
@@ -23,18 +22,27 @@ def check_dependencies():
     
     for package in required_packages:
         try:
-            pkg_resources.get_distribution(package)
-        except pkg_resources.DistributionNotFound:
+            metadata.distribution(package)
+        except metadata.PackageNotFoundError:
             missing_packages.append(package)
     
     return missing_packages
 
 def install_dependencies(packages):
-    """Install missing dependencies"""
+    """Install missing dependencies with a single pip invocation"""
+    import os
+    import subprocess
+    
+    command = [
+        sys.executable, "-m", "pip", "install",
+        "--disable-pip-version-check", "--no-input", "--prefer-binary",
+    ]
+    if os.environ.get("VERBOSE"):
+        command.append("-v")
+    
     try:
-        for package in packages:
-            print(f"Installing {package}...")
-            subprocess.check_call([sys.executable, "-m", "pip", "install", package])
+        print(f"Installing {', '.join(packages)}...")
+        subprocess.check_call([*command, *packages])
         return True
     except subprocess.CalledProcessError:
         return False
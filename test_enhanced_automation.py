@@ -212,6 +212,70 @@ def test_error_handling():
     
     return True
 
+def test_batch_queue_signalling():
+    """Test that queued GUI batches are each authorized, processed and signalled"""
+    print("Testing all-batches queue signalling...")
+    
+    import threading
+    from enhanced_automation import EnhancedAutomationSystem, AutomationMode
+    from enhanced_gui_automation import EnhancedAutomationGUI
+    
+    class RecordingRoot:
+        """Stands in for Tk: records scheduled UI callbacks instead of running them"""
+        def __init__(self):
+            self.calls = []
+        
+        def after(self, delay, func, *args):
+            self.calls.append(func.__name__)
+    
+    def run_queue(batches, failing_batch=None):
+        system = EnhancedAutomationSystem(AutomationMode.BASIC)
+        system.set_batch_data(batches[0])
+        processed = []
+        
+        def process_data_batches():
+            processed.append(system.batch_data)
+            return len(processed) != failing_batch
+        
+        # Skip the browser: the voting page is reached immediately
+        system._process_data_batches = process_data_batches
+        system._wait_for_voting_page = system._wait_for_form_input_authorization
+        
+        result = {}
+        run = threading.Thread(target=lambda: result.update(success=system._run_basic_mode()), daemon=True)
+        run.start()
+        
+        gui = EnhancedAutomationGUI.__new__(EnhancedAutomationGUI)
+        gui.root = RecordingRoot()
+        gui.automation_system = system
+        gui._batch_queue = tuple(enumerate(batches))
+        gui.processing_all_batches = True
+        gui.is_running = True
+        gui._run_batch_queue()
+        
+        run.join(timeout=10)
+        assert not run.is_alive()
+        return result['success'], processed, gui.root.calls, system.completed_form_inputs
+    
+    batches = [[[0] * 13], [[1] * 13], [[2] * 13]]
+    
+    success, processed, calls, signalled = run_queue(batches)
+    assert success
+    assert processed == batches
+    assert signalled == len(batches)
+    assert calls.count('_on_batch_finished') == len(batches)
+    assert calls[-1] == 'complete_all_batches_processing'
+    print("✅ Every queued batch processed and signalled")
+    
+    success, processed, calls, signalled = run_queue(batches, failing_batch=2)
+    assert not success
+    assert processed == batches[:2]
+    assert calls.count('_on_batch_finished') == 1
+    assert calls[-1] == 'abort_all_batches_processing'
+    print("✅ Queue stops at a failed batch")
+    
+    return True
+
 def main():
     """Run all enhanced tests"""
     print("Enhanced Web Form Automation System - Test Suite")
@@ -227,7 +291,8 @@ def main():
         test_enhanced_csv_handling,
         test_action_types_coverage,
         test_json_serialization,
-        test_error_handling
+        test_error_handling,
+        test_batch_queue_signalling
     ]
     
     passed = 0
@@ -26,13 +26,40 @@ from webdriver_manager.firefox import GeckoDriverManager
 from webdriver_manager.microsoft import EdgeChromiumDriverManager
 from config import Config
 import time
-from typing import Optional, List, Union
+from functools import lru_cache
+from typing import Optional, List, Tuple, Union
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=None)
+def compile_selectors(selectors: Tuple[str, ...]) -> Tuple[Tuple[str, str], ...]:
+    """
+    Resolve selector strings to (By, value) locators once per selector list
+    
+    Args:
+        selectors: XPath ('//...'), CSS with ':contains()' or plain CSS selectors
+        
+    Returns:
+        Tuple of locators in the same order
+    """
+    locators = []
+    for selector in selectors:
+        if selector.startswith("//"):
+            # XPath selector
+            locators.append((By.XPATH, selector))
+        elif ":contains(" in selector:
+            # Convert CSS :contains to XPath
+            text = selector.split(":contains('")[1].split("')")[0]
+            tag = selector.split(":contains(")[0] or "*"
+            locators.append((By.XPATH, f"//{tag}[contains(text(), '{text}')]"))
+        else:
+            # CSS selector
+            locators.append((By.CSS_SELECTOR, selector))
+    return tuple(locators)
+
 class WebDriverManager:
     """Manages WebDriver lifecycle and common operations"""
     
@@ -69,6 +96,7 @@ class WebDriverManager:
             assert self.driver is not None
             self.driver.implicitly_wait(Config.IMPLICIT_WAIT)
             self.driver.set_page_load_timeout(Config.PAGE_LOAD_TIMEOUT)
+            self._widen_connection_pool(Config.WEBDRIVER_POOL_MAXSIZE)
             
             # Initialize WebDriverWait
             self.wait = WebDriverWait(self.driver, self.timeout)
@@ -83,6 +111,27 @@ class WebDriverManager:
             logger.error(f"Unexpected error during WebDriver setup: {e}")
             return False
     
+    def _widen_connection_pool(self, maxsize: int):
+        """
+        Let overlapping WebDriver commands use separate keep-alive connections
+        
+        Selenium's local drivers talk to the driver service through a urllib3
+        PoolManager with a single connection per host, so a command issued from
+        another thread waits for (or discards) that connection.
+        
+        Args:
+            maxsize: Connections to keep per host
+        """
+        conn = getattr(getattr(self.driver, "command_executor", None), "_conn", None)
+        pool_kw = getattr(conn, "connection_pool_kw", None)
+        if pool_kw is None:
+            logger.debug("WebDriver connection pool not found, keeping defaults")
+            return
+        pool_kw["maxsize"] = maxsize
+        # Drop the pools created so far so the next request builds one with the new size
+        conn.clear()
+        logger.debug(f"WebDriver connection pool maxsize set to {maxsize}")
+    
     def _setup_chrome_driver(self):
         """Setup Chrome WebDriver"""
         options = Config.get_chrome_options()
@@ -210,27 +259,9 @@ class WebDriverManager:
             WebElement if found, None otherwise
         """
         assert self.wait is not None and self.driver is not None
-        for selector in selectors:
+        for selector, locator in zip(selectors, compile_selectors(tuple(selectors))):
             try:
-                # Handle different selector types
-                if selector.startswith("//"):
-                    # XPath selector
-                    element = self.wait.until(
-                        EC.presence_of_element_located((By.XPATH, selector))
-                    )
-                elif ":contains(" in selector:
-                    # Convert CSS :contains to XPath
-                    text = selector.split(":contains('")[1].split("')")[0]
-                    tag = selector.split(":contains(")[0] or "*"
-                    xpath = f"//{tag}[contains(text(), '{text}')]"
-                    element = self.wait.until(
-                        EC.presence_of_element_located((By.XPATH, xpath))
-                    )
-                else:
-                    # CSS selector
-                    element = self.wait.until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                    )
+                element = self.wait.until(EC.presence_of_element_located(locator))
                 
                 logger.debug(f"Found {element_name} using selector: {selector}")
                 return element